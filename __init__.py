@@ -1 +1,14 @@
+from odoo.tools import SQL
+
 from . import models
+from . import controllers
+from .models.external_id import LOOKUP_INVALIDATION_TABLE
+from .models.external_id_change import CHANGE_SEQUENCE
+from .models.external_sync_job import BATCH_START_TABLE
+
+
+def uninstall_hook(env: "odoo.api.Environment") -> None:
+    # Created by hand in init(), so the ORM does not know to remove them
+    for table in (LOOKUP_INVALIDATION_TABLE, BATCH_START_TABLE):
+        env.cr.execute(SQL("DROP TABLE IF EXISTS %s", SQL.identifier(table)))
+    env.cr.execute(SQL("DROP SEQUENCE IF EXISTS %s", SQL.identifier(CHANGE_SEQUENCE)))
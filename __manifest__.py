@@ -13,15 +13,21 @@
     "depends": ["hr", "base", "product"],
     "data": [
         "data/external_systems.xml",
+        "data/ir_cron.xml",
         "security/ir.model.access.csv",
         "views/menu_views.xml",
         "views/external_system_views.xml",
         "views/external_id_views.xml",
         "views/external_system_url_views.xml",
+        "views/external_id_change_views.xml",
+        "views/external_sync_job_views.xml",
+        "views/external_id_stats_views.xml",
+        "views/external_id_promotion_views.xml",
         "views/hr_employee_views.xml",
         "views/res_partner_views.xml",
         "views/product_template_views.xml",
     ],
+    "uninstall_hook": "uninstall_hook",
     "installable": True,
     "application": False,
 }
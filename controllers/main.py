@@ -0,0 +1,98 @@
+import gzip
+import io
+import json
+import tempfile
+import zlib
+
+from werkzeug.exceptions import BadRequest, NotFound, RequestEntityTooLarge
+from werkzeug.wsgi import wrap_file
+
+from odoo import http
+from odoo.http import request
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+GZIP_MIN_SIZE = 1024
+RESOLVE_MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+class ExternalIdController(http.Controller):
+    @http.route("/external_ids/export/<string:file_format>", type="http", auth="user", methods=["GET"])
+    def export_external_ids(
+        self,
+        file_format: str,
+        system: str = "",
+        model: str = "",
+        since: str = "",
+        until: str = "",
+        include_archived: str = "",
+        **_kwargs: str,
+    ) -> http.Response:
+        if file_format not in EXPORT_CONTENT_TYPES:
+            raise NotFound()
+        # Spill to disk past a few MB so large exports never sit in worker memory
+        buffer = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        text = io.TextIOWrapper(buffer, encoding="utf-8", newline="")
+        try:
+            request.env["external.id"].export_external_ids(
+                text,
+                file_format=file_format,
+                system_codes=[code for code in system.split(",") if code],
+                res_models=[name for name in model.split(",") if name],
+                last_sync_from=since or None,
+                last_sync_to=until or None,
+                include_archived=include_archived in ("1", "true"),
+            )
+        except ValueError as error:
+            buffer.close()
+            raise BadRequest(str(error)) from error
+        text.flush()
+        text.detach()
+        buffer.seek(0)
+        return request.make_response(
+            wrap_file(request.httprequest.environ, buffer),
+            headers=[
+                ("Content-Type", EXPORT_CONTENT_TYPES[file_format]),
+                ("Content-Disposition", f'attachment; filename="external_ids.{file_format}"'),
+            ],
+        )
+
+    @http.route("/external_ids/resolve", type="http", auth="user", methods=["POST"], csrf=False)
+    def resolve_external_ids(self, **_kwargs: str) -> http.Response:
+        body = request.httprequest.get_data()
+        if request.httprequest.headers.get("Content-Encoding", "").lower() == "gzip":
+            body = self._gunzip_body(body)
+        elif len(body) > RESOLVE_MAX_BODY_SIZE:
+            raise RequestEntityTooLarge()
+        try:
+            payload = json.loads(body or b"[]")
+        except ValueError as error:
+            raise BadRequest("Invalid JSON body") from error
+        queries = payload.get("requests") if isinstance(payload, dict) else payload
+        if not isinstance(queries, list) or not all(isinstance(query, dict) for query in queries):
+            raise BadRequest("Expected a list of lookup requests")
+
+        results = request.env["external.id"].resolve_external_id_batch(queries)
+        data = json.dumps({"results": results}, separators=(",", ":")).encode()
+        headers = [("Content-Type", "application/json")]
+        if len(data) >= GZIP_MIN_SIZE:
+            # Shared caches must not hand a gzipped body to a client that did not ask for one
+            headers.append(("Vary", "Accept-Encoding"))
+            if "gzip" in request.httprequest.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data)
+                headers.append(("Content-Encoding", "gzip"))
+        return request.make_response(data, headers=headers)
+
+    @staticmethod
+    def _gunzip_body(body: bytes) -> bytes:
+        # Bounded read: a small gzip bomb must not expand into worker memory
+        try:
+            with gzip.GzipFile(fileobj=io.BytesIO(body)) as stream:
+                data = stream.read(RESOLVE_MAX_BODY_SIZE + 1)
+        except (OSError, EOFError, zlib.error) as error:
+            raise BadRequest("Invalid gzip body") from error
+        if len(data) > RESOLVE_MAX_BODY_SIZE:
+            raise RequestEntityTooLarge()
+        return data
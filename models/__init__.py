@@ -3,6 +3,14 @@ from . import external_system_url
 from . import url_template_rename_wizard
 from . import external_id_mixin
 from . import external_id
+from . import external_id_import
+from . import external_id_export
+from . import external_id_purge
+from . import external_id_change
+from . import external_sync_job
+from . import ir_cron
+from . import external_id_stats
+from . import external_id_promotion
 from . import hr_employee
 from . import res_partner
 from . import product_template
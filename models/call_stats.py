@@ -0,0 +1,91 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from odoo.tools import str2bool
+
+_logger = logging.getLogger(__name__)
+
+INSTRUMENTATION_PARAM = "external_ids.instrumentation"
+FLUSH_INTERVAL_PARAM = "external_ids.instrumentation_flush_interval"
+DEFAULT_FLUSH_INTERVAL = 60
+
+CallKey = tuple[str, str, str]
+
+
+# Per-worker aggregate of instrumented calls, keyed by (method, calling model, system code).
+# Each entry holds [calls, queries, seconds]; it is drained to external.id.stats periodically.
+class CallStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.entries: dict[CallKey, list] = {}
+        self.last_flush = time.monotonic()
+
+    def add(self, key: CallKey, queries: int, duration: float) -> None:
+        with self._lock:
+            entry = self.entries.setdefault(key, [0, 0, 0.0])
+            entry[0] += 1
+            entry[1] += queries
+            entry[2] += duration
+
+    def is_due(self, interval: float) -> bool:
+        return time.monotonic() - self.last_flush >= interval
+
+    def drain(self) -> dict[CallKey, list]:
+        with self._lock:
+            entries, self.entries = self.entries, {}
+            self.last_flush = time.monotonic()
+            return entries
+
+
+_stats: dict[str, CallStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_call_stats(dbname: str) -> CallStats:
+    with _stats_lock:
+        if dbname not in _stats:
+            _stats[dbname] = CallStats()
+        return _stats[dbname]
+
+
+def get_flush_interval(params: "odoo.model.ir_config_parameter") -> int:
+    # Runs in the wrapper's finally block: a bad value must never replace the method's own outcome
+    try:
+        return int(params.get_param(FLUSH_INTERVAL_PARAM) or DEFAULT_FLUSH_INTERVAL)
+    except ValueError:
+        return DEFAULT_FLUSH_INTERVAL
+
+
+def instrumented(method: Callable) -> Callable:
+    # Query counts and timings are inclusive: a method calling another instrumented method
+    # also carries the cost of that inner call.
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        params = self.env["ir.config_parameter"].sudo()
+        if not str2bool(params.get_param(INSTRUMENTATION_PARAM) or "0", False):
+            return method(self, *args, **kwargs)
+        cr = self.env.cr
+        query_count = cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            try:
+                system_code = signature.bind_partial(self, *args, **kwargs).arguments.get("system_code")
+            except TypeError:
+                # The call itself had bad arguments and is already raising
+                system_code = None
+            stats = get_call_stats(cr.dbname)
+            duration = time.perf_counter() - start
+            stats.add((method.__name__, self._name, system_code or ""), cr.sql_log_count - query_count, duration)
+            if stats.is_due(get_flush_interval(params)):
+                self.env["external.id.stats"]._flush_call_stats(stats)
+
+    return wrapper
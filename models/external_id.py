@@ -1,8 +1,27 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
 from typing import Any
 
-from odoo import models, fields, api
-from odoo.osv import expression
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
+from odoo.osv import expression
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+from .call_stats import instrumented
+from .external_system import SystemInfo
+from .lookup_cache import (
+    DEFAULT_LOOKUP_CACHE_SIZE,
+    DEFAULT_LOOKUP_CACHE_TTL,
+    LOOKUP_CACHE_REPLAY_WINDOW,
+    LookupCache,
+    get_lookup_cache,
+)
+
+LOOKUP_INVALIDATION_TABLE = "external_id_lookup_invalidation"
+# Past this many changed keys a transaction logs a single "clear" row instead
+LOOKUP_INVALIDATION_MAX_KEYS = 1000
+MAPPING_FIELDS = {"system_id", "resource", "external_id", "res_model", "res_id", "active"}
 
 
 class ExternalId(models.Model):
@@ -38,6 +57,8 @@ class ExternalId(models.Model):
         string="External ID",
         required=True,
         index=True,
+        # IDs are plain identifiers: skipping unaccent() lets ilike use the trigram index
+        unaccent=False,
         help="The ID of this record in the external system",
     )
     display_name = fields.Char(compute="_compute_display_name")
@@ -68,6 +89,52 @@ class ExternalId(models.Model):
         ),
     ]
 
+    def init(self) -> None:
+        super().init()
+        # The unique constraints already index (res_model, res_id, system_id, resource) and
+        # (system_id, resource, external_id)
+        # (system_id, external_id): get_record_by_external_id, which ignores the resource
+        create_index(
+            self.env.cr,
+            "external_id_system_value_idx",
+            self._table,
+            ["system_id", "external_id"],
+            where="active",
+        )
+        # Stale-since scans: per system, ordered by last sync (never synced first)
+        create_index(
+            self.env.cr,
+            "external_id_stale_sync_idx",
+            self._table,
+            ["system_id", "COALESCE(last_sync, '-infinity')", "id"],
+            where="active",
+        )
+        # Substring autocomplete in name_search; only possible with the pg_trgm extension
+        if self.env.registry.has_trigram:
+            create_index(
+                self.env.cr,
+                "external_id_external_id_trgm_idx",
+                self._table,
+                ["external_id gin_trgm_ops"],
+                method="gin",
+            )
+        # Lookup cache keys changed by committed transactions, replayed by every worker.
+        # A row without system_code clears the whole cache.
+        self.env.cr.execute(
+            SQL(
+                """
+                CREATE TABLE IF NOT EXISTS %s (
+                    id bigserial PRIMARY KEY,
+                    system_code varchar,
+                    resource varchar,
+                    external_id varchar,
+                    create_date timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'UTC')
+                )
+                """,
+                SQL.identifier(LOOKUP_INVALIDATION_TABLE),
+            )
+        )
+
     @api.model
     def default_get(self, fields_list: list[str]) -> dict[str, Any]:
         values = super().default_get(fields_list)
@@ -96,13 +163,40 @@ class ExternalId(models.Model):
                 vals["resource"] = "default"
             if "external_id" in vals and isinstance(vals["external_id"], str):
                 vals["external_id"] = vals["external_id"].strip()
-        return super().create(vals_list)
+        records = super().create(vals_list)
+        self._invalidate_lookup_cache(records._get_lookup_cache_keys())
+        self.env["external.id.change"]._record_changes("create", records.ids)
+        self.env["external.id.promotion"]._refresh_promoted_columns(records._get_promotion_targets())
+        return records
 
     def write(self, vals: "odoo.values.external_id") -> bool:
         if "external_id" in vals and isinstance(vals["external_id"], str):
             vals = dict(vals)
             vals["external_id"] = vals["external_id"].strip()
-        return super().write(vals)
+        if not MAPPING_FIELDS.intersection(vals):
+            return super().write(vals)
+        keys = self._get_lookup_cache_keys()
+        targets = self._get_promotion_targets()
+        result = super().write(vals)
+        self._invalidate_lookup_cache(keys | self._get_lookup_cache_keys())
+        self.env["external.id.change"]._record_changes("write", self.ids)
+        self.env["external.id.promotion"]._refresh_promoted_columns(targets | self._get_promotion_targets())
+        return result
+
+    def unlink(self) -> bool:
+        keys = self._get_lookup_cache_keys()
+        targets = self._get_promotion_targets()
+        changes = self.env["external.id.change"]._snapshot_changes("unlink", self.ids)
+        result = super().unlink()
+        self.env["external.id.change"]._insert_changes(changes)
+        self._invalidate_lookup_cache(keys)
+        self.env["external.id.promotion"]._refresh_promoted_columns(targets)
+        return result
+
+    def _get_promotion_targets(self) -> set[tuple[str, int, int, str]]:
+        if not self.env["external.id.promotion"]._get_promotions():
+            return set()
+        return {(record.res_model, record.res_id, record.system_id.id, record.resource) for record in self.sudo()}
 
     @api.model
     def _reference_models(self) -> list[tuple[str, str]]:
@@ -117,21 +211,31 @@ class ExternalId(models.Model):
                 label = default_model
             return [(default_model, label)]
 
-        # Otherwise, detect eligible models by the presence of the mixin action.
-        items: list[tuple[str, str]] = []
-        for model_name in self.env:
-            try:
-                model = self.env[model_name]
-            except Exception:  # pragma: no cover - defensive registry guard
-                continue
-            if getattr(model, "_abstract", False) or getattr(model, "_transient", False):
-                continue
-            if hasattr(model, "action_view_external_ids"):
-                label = model._description or model_name
-                items.append((model_name, label))
+        # Otherwise, offer every concrete model inheriting the mixin.
+        items = [(model_name, self.env[model_name]._description or model_name) for model_name in self._mixin_models()]
         items.sort(key=lambda x: x[1].lower())
         return items
 
+    @api.model
+    @tools.ormcache()
+    def _mixin_models(self) -> tuple[str, ...]:
+        # Follow the _inherit chains down from the mixin once per registry instead of
+        # instantiating every model on each fields_get.
+        registry = self.env.registry
+        pending = list(registry["external.id.mixin"]._inherit_children)
+        seen: set[str] = set()
+        names: list[str] = []
+        while pending:
+            model_name = pending.pop()
+            if model_name in seen or model_name not in registry:
+                continue
+            seen.add(model_name)
+            model_class = registry[model_name]
+            pending.extend(model_class._inherit_children)
+            if not model_class._abstract and not model_class._transient:
+                names.append(model_name)
+        return tuple(sorted(names))
+
     @api.depends("res_model", "res_id")
     def _compute_reference(self) -> None:
         for record in self:
@@ -169,34 +273,46 @@ class ExternalId(models.Model):
             return [("res_model", "=", value._name), ("res_id", "=", value.id)]
         return []
 
+    def _get_referenced_records(self) -> dict[str, Any]:
+        # Map each res_model to its existing referenced records (None when the model is unknown),
+        # so computes issue one existence query per model instead of one per row.
+        ids_by_model: dict[str, set[int]] = defaultdict(set)
+        for record in self:
+            if record.res_model and record.res_id:
+                ids_by_model[record.res_model].add(record.res_id)
+        referenced: dict[str, Any] = {}
+        for model_name, res_ids in ids_by_model.items():
+            referenced[model_name] = self.env[model_name].browse(res_ids).exists() if model_name in self.env else None
+        return referenced
+
     @api.depends("res_model", "res_id")
     def _compute_record_name(self) -> None:
+        names_by_model: dict[str, dict[int, str] | None] = {}
+        for model_name, targets in self._get_referenced_records().items():
+            names_by_model[model_name] = (
+                {target.id: target.display_name for target in targets} if targets is not None else None
+            )
         for record in self:
             if record.res_model and record.res_id:
-                try:
-                    referenced_record = self.env[record.res_model].browse(record.res_id)
-                    if referenced_record.exists():
-                        record.record_name = referenced_record.display_name
-                    else:
-                        record.record_name = f"[Deleted {record.res_model}]"
-                except (KeyError, AttributeError, ValueError):
+                names = names_by_model[record.res_model]
+                if names is None:
                     record.record_name = f"[Invalid {record.res_model}]"
+                elif record.res_id in names:
+                    record.record_name = names[record.res_id]
+                else:
+                    record.record_name = f"[Deleted {record.res_model}]"
             else:
                 record.record_name = ""
 
     @api.depends("res_model", "res_id")
     def _compute_company_id(self) -> None:
+        companies_by_model: dict[str, dict[int, int]] = {}
+        for model_name, targets in self._get_referenced_records().items():
+            if targets is not None and "company_id" in targets._fields:
+                companies_by_model[model_name] = {target.id: target.company_id.id for target in targets}
         for record in self:
-            company = False
-            if record.res_model and record.res_id:
-                try:
-                    model = self.env[record.res_model]
-                except KeyError:
-                    model = None
-                if model and "company_id" in model._fields:
-                    ref = model.browse(record.res_id)
-                    company = ref.company_id.id if ref.exists() else False
-            record.company_id = company
+            companies = companies_by_model.get(record.res_model) or {}
+            record.company_id = companies.get(record.res_id, False)
 
     @api.depends("system_id.name", "system_id.id_prefix", "external_id", "record_name")
     def _compute_display_name(self) -> None:
@@ -210,52 +326,521 @@ class ExternalId(models.Model):
 
     @api.constrains("external_id", "system_id")
     def _check_id_format(self) -> None:
-        for record in self:
-            if record.system_id.id_format:
-                import re
+        errors = []
+        for system, records in self.grouped("system_id").items():
+            pattern = system._get_id_pattern()
+            if not pattern:
+                continue
+            invalid = [record.external_id for record in records if not pattern.match(record.external_id or "")]
+            if invalid:
+                errors.append(self._invalid_format_message(system.name, system.id_format, invalid))
+        if errors:
+            raise ValidationError("\n".join(errors))
 
-                if not re.match(record.system_id.id_format, record.external_id):
-                    raise ValidationError(
-                        f"External ID '{record.external_id}' does not match the expected format "
-                        f"for {record.system_id.name}: {record.system_id.id_format}"
-                    )
+    @staticmethod
+    def _invalid_format_message(system_name: str, id_format: str, invalid: list[str]) -> str:
+        if len(invalid) == 1:
+            return f"External ID '{invalid[0]}' does not match the expected format for {system_name}: {id_format}"
+        return (
+            f"External IDs {', '.join(repr(value) for value in invalid)} do not match the expected format "
+            f"for {system_name}: {id_format}"
+        )
 
     def action_sync(self) -> "odoo.values.ir_actions_client":
         self.ensure_one()
-        self.last_sync = fields.Datetime.now()
+        self.enqueue_sync()
         return {
             "type": "ir.actions.client",
             "tag": "display_notification",
             "params": {
-                "title": "Sync Complete",
-                "message": f"Synchronized {self.display_name}",
+                "title": "Sync Queued",
+                "message": f"Queued {self.display_name} for synchronization",
                 "type": "success",
             },
         }
 
+    def enqueue_sync(self) -> "odoo.model.external_sync_job":
+        self.check_access("write")
+        return self.env["external.sync.job"].sudo()._enqueue(self)
+
+    @instrumented
+    def mark_synced(self, timestamp: datetime | None = None) -> int:
+        if not self:
+            return 0
+        self.check_access("write")
+        self.flush_recordset(["last_sync"])
+        self.env.cr.execute(
+            SQL(
+                "UPDATE external_id SET last_sync = %s, write_uid = %s, write_date = %s WHERE id = ANY(%s)",
+                timestamp or fields.Datetime.now(),
+                self.env.uid,
+                fields.Datetime.now(),
+                self.ids,
+            )
+        )
+        self.invalidate_recordset(["last_sync", "write_uid", "write_date"])
+        return self.env.cr.rowcount
+
+    @api.model
+    @instrumented
+    def get_stale_external_ids(
+        self,
+        stale_before: datetime | str,
+        system_code: str | None = None,
+        res_model: str | None = None,
+        limit: int = 1000,
+        cursor: tuple[str, int] | None = None,
+    ) -> tuple["odoo.model.external_id", tuple[str, int] | None]:
+        # Active IDs never synced or last synced before stale_before, paged by a
+        # (last_sync, id) keyset cursor that stays valid while pages are marked synced.
+        self.check_access("read")
+        conditions = [
+            SQL("active"),
+            SQL("COALESCE(last_sync, '-infinity') < %s", fields.Datetime.to_datetime(stale_before)),
+        ]
+        if system_code:
+            system = self.env["external.system"]._resolve_system(system_code)
+            if not system:
+                return self.browse(), None
+            conditions.append(SQL("system_id = %s", system.id))
+        if res_model:
+            conditions.append(SQL("res_model = %s", res_model))
+        if cursor:
+            conditions.append(SQL("(COALESCE(last_sync, '-infinity'), id) > (%s::timestamp, %s)", cursor[0], cursor[1]))
+
+        self.flush_model(["active", "last_sync", "system_id", "res_model"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT id, last_sync
+                  FROM external_id
+                 WHERE %s
+              ORDER BY COALESCE(last_sync, '-infinity'), id
+                 LIMIT %s
+                """,
+                SQL(" AND ").join(conditions),
+                limit,
+            )
+        )
+        rows = self.env.cr.fetchall()
+        if len(rows) < limit:
+            return self.browse([row[0] for row in rows]), None
+        last_id, last_sync = rows[-1]
+        return self.browse([row[0] for row in rows]), (str(last_sync) if last_sync else "-infinity", last_id)
+
     @api.model
+    @instrumented
     def get_record_by_external_id(
-        self, system_code: str, external_id: str
+        self, system_code: str, external_id: str, resource: str | None = None
     ) -> "odoo.model.res_partner | odoo.model.hr_employee | odoo.model.product_product | None":
         System = self.env["external.system"]
-        system = System.search([("code", "=", system_code)], limit=1)
+        system = System._resolve_system(system_code)
 
         if not system:
             return None
 
-        external_record = self.search(
-            [("system_id", "=", system.id), ("external_id", "=", external_id), ("active", "=", True)], limit=1
+        self.check_access("read")
+        cache, position = self._get_lookup_cache()
+        key = (system.code, resource, external_id)
+        # Keys changed by the running transaction are read from the database until it commits
+        pending = self._is_lookup_key_pending(key)
+        target = None if pending else cache.get(key)
+        if target is not None:
+            # Only mixin hosts are cached, and their unlink invalidates the keys: no existence check
+            res_model, res_id = target
+            return self.env[res_model].browse(res_id)
+
+        domain = [("system_id", "=", system.id), ("external_id", "=", external_id), ("active", "=", True)]
+        if resource:
+            domain.append(("resource", "=", resource))
+        external_record = self.search(domain, limit=1)
+        if not (external_record and external_record.res_model and external_record.res_id):
+            return None
+        res_model, res_id = external_record.res_model, external_record.res_id
+        try:
+            record = self.env[res_model].browse(res_id)
+            if not record.exists():
+                return None
+        except (KeyError, AttributeError, ValueError):
+            return None
+
+        if res_model in self._mixin_models() and not pending:
+            cache.set(key, (res_model, res_id), position)
+        return record
+
+    # Reverse-lookup cache ---------------------------------------------------
+    def _get_lookup_cache_keys(self) -> set[tuple[str, str | None, str]]:
+        keys = set()
+        for record in self:
+            keys |= self._lookup_cache_keys_for(record.system_id.code, record.resource, [record.external_id])
+        return keys
+
+    @api.model
+    def _get_lookup_cache(self) -> tuple[LookupCache, int]:
+        # Replays the invalidation log once per transaction. The returned position is the newest
+        # log row visible to this transaction's snapshot, which is also the one its lookups read.
+        cr = self.env.cr
+        cache = get_lookup_cache(cr.dbname)
+        position = cr.postcommit.data.get("external_ids.lookup_cache_position")
+        if position is not None:
+            return cache, position
+
+        params = self.env["ir.config_parameter"].sudo()
+        cache.configure(
+            int(params.get_param("external_ids.lookup_cache_size", DEFAULT_LOOKUP_CACHE_SIZE)),
+            float(params.get_param("external_ids.lookup_cache_ttl", DEFAULT_LOOKUP_CACHE_TTL)),
         )
+        table = SQL.identifier(LOOKUP_INVALIDATION_TABLE)
+        cr.execute(SQL("SELECT COALESCE(max(id), 0) FROM %s", table))
+        position = cr.fetchone()[0]
+        if cache.needs_reset():
+            cache.reset(position)
+        elif position > cache.position:
+            cr.execute(
+                SQL(
+                    """
+                    SELECT system_code, resource, external_id FROM %s
+                     WHERE id > %s AND id <= %s
+                  ORDER BY id
+                     LIMIT %s
+                    """,
+                    table,
+                    cache.position,
+                    position,
+                    LOOKUP_INVALIDATION_MAX_KEYS + 1,
+                )
+            )
+            rows = cr.fetchall()
+            clear = len(rows) > LOOKUP_INVALIDATION_MAX_KEYS or any(code is None for code, _r, _v in rows)
+            cache.apply(position, rows, clear=clear)
+        cr.postcommit.data["external_ids.lookup_cache_position"] = position
+        return cache, position
 
-        if external_record and external_record.res_model and external_record.res_id:
-            try:
-                record = self.env[external_record.res_model].browse(external_record.res_id)
-                if record.exists():
-                    return record
-            except (KeyError, AttributeError, ValueError):
-                pass
+    @api.model
+    def _is_lookup_key_pending(self, key: tuple[str, str | None, str]) -> bool:
+        pending = self.env.cr.postcommit.data.get("external_ids.lookup_cache")
+        return bool(pending and (pending["clear"] or key in pending["keys"]))
+
+    @api.model
+    def _invalidate_lookup_cache(self, keys: set[tuple[str, str | None, str]] | None = None) -> None:
+        # keys=None drops every entry (system changes). Other transactions keep reading the
+        # committed mapping until this one commits, so nothing is dropped before then.
+        cr = self.env.cr
+        pending = cr.postcommit.data.get("external_ids.lookup_cache")
+        if pending is None:
+            pending = cr.postcommit.data["external_ids.lookup_cache"] = {"keys": set(), "clear": False}
+            cache = get_lookup_cache(cr.dbname)
+            registry = self.env.registry
+
+            @cr.postcommit.add
+            def log_invalidation() -> None:
+                clear = pending["clear"]
+                if clear:
+                    cache.clear()
+                else:
+                    cache.discard(pending["keys"])
+                rows = [(None, None, None)] if clear else list(pending["keys"])
+                with registry.cursor() as log_cr:
+                    # Serialized so that ids become visible in order and no worker replays past a gap
+                    log_cr.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s))", LOOKUP_INVALIDATION_TABLE))
+                    log_cr.execute(
+                        SQL(
+                            """
+                            INSERT INTO %s (system_code, resource, external_id)
+                            SELECT * FROM unnest(%s::varchar[], %s::varchar[], %s::varchar[])
+                            """,
+                            SQL.identifier(LOOKUP_INVALIDATION_TABLE),
+                            [row[0] for row in rows],
+                            [row[1] for row in rows],
+                            [row[2] for row in rows],
+                        )
+                    )
+
+        if pending["clear"]:
+            return
+        if keys is not None:
+            pending["keys"] |= keys
+        # Past the limit the whole cache is dropped anyway: stop collecting keys, so a large
+        # import does not hold every changed key in memory until it commits
+        if keys is None or len(pending["keys"]) > LOOKUP_INVALIDATION_MAX_KEYS:
+            pending["clear"] = True
+            pending["keys"] = set()
+
+    @staticmethod
+    def _lookup_cache_keys_for(system_code: str, resource: str, values: list[str]) -> set[tuple[str, str | None, str]]:
+        # Lookups without a resource are cached under None
+        return {(system_code, key_resource, value) for value in values for key_resource in (resource, None)}
+
+    @api.autovacuum
+    def _gc_lookup_invalidations(self) -> None:
+        # Workers that did not replay within the window reset their cache; the newest row stays
+        # so that positions never move backwards.
+        table = SQL.identifier(LOOKUP_INVALIDATION_TABLE)
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE create_date < %s AND id < (SELECT max(id) FROM %s)",
+                table,
+                fields.Datetime.now() - timedelta(seconds=2 * LOOKUP_CACHE_REPLAY_WINDOW),
+                table,
+            )
+        )
+
+    @api.model
+    def get_lookup_cache_stats(self) -> dict[str, Any]:
+        return get_lookup_cache(self.env.cr.dbname).stats()
+
+    @api.model
+    @instrumented
+    def get_records_by_external_ids(
+        self, system_code: str, external_ids: list[str], resource: str | None = None
+    ) -> dict[str, Any]:
+        System = self.env["external.system"]
+        system = System._resolve_system(system_code)
+
+        if not system:
+            return {"records": {}, "archived": [], "missing": self._normalize_external_id_values(external_ids)}
+
+        return self._lookup_external_ids(system.id, external_ids, resource)
+
+    @api.model
+    @instrumented
+    def resolve_external_id_batch(self, queries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        # Answers several forward ({system, resource, external_ids[, model]}) and reverse
+        # ({model, ids, system[, resource]}) lookups, one set-based query per entry.
+        mixin_class = self.env.registry["external.id.mixin"]
+        results: list[dict[str, Any]] = []
+        for query in queries:
+            system_code = query.get("system")
+            res_model = query.get("model")
+            resource = query.get("resource")
+            external_ids = self._parse_batch_values(query.get("external_ids", []))
+            ids = self._parse_batch_values(query.get("ids", []), as_ids=True)
+            if not all(isinstance(value, str | None) for value in (system_code, res_model, resource)):
+                results.append({"error": "Expected strings for 'system', 'model' and 'resource'"})
+            elif res_model and (res_model not in self.env or not isinstance(self.env[res_model], mixin_class)):
+                results.append({"error": f"Model '{res_model}' does not support external IDs"})
+            elif not self.env["external.system"]._resolve_system(system_code):
+                results.append({"error": f"External system with code '{system_code}' not found"})
+            elif external_ids is None:
+                results.append({"error": "Expected a list of strings or integers for 'external_ids'"})
+            elif ids is None:
+                results.append({"error": "Expected a list of integers for 'ids'"})
+            elif "external_ids" in query:
+                if res_model:
+                    found = self.env[res_model].search_by_external_ids(system_code, external_ids, resource)
+                    records = {value: record.id for value, record in found["records"].items()}
+                else:
+                    found = self.get_records_by_external_ids(system_code, external_ids, resource)
+                    records = {value: [record._name, record.id] for value, record in found["records"].items()}
+                results.append({"records": records, "archived": found["archived"], "missing": found["missing"]})
+            elif res_model and "ids" in query:
+                values = self.env[res_model].browse(ids).get_external_system_ids(system_code, resource)
+                results.append(
+                    {
+                        "external_ids": {str(res_id): value for res_id, value in values.items()},
+                        "missing": [res_id for res_id in ids if res_id not in values],
+                    }
+                )
+            else:
+                results.append({"error": "Expected 'external_ids', or 'model' with 'ids'"})
+        return results
+
+    @staticmethod
+    def _parse_batch_values(values: Any, as_ids: bool = False) -> list | None:
+        # Batch entries come straight from HTTP clients: only lists of strings or integers are accepted
+        if not isinstance(values, list) or not all(
+            isinstance(value, str | int) and not isinstance(value, bool) for value in values
+        ):
+            return None
+        if not as_ids:
+            return [str(value) for value in values]
+        if not all(isinstance(value, int) or value.strip().isdigit() for value in values):
+            return None
+        return [int(value) for value in values]
+
+    @staticmethod
+    def _normalize_external_id_values(values: list[str]) -> list[str]:
+        # Strip, drop blanks and de-duplicate while keeping the caller's order
+        return list(dict.fromkeys(v.strip() for v in values or [] if isinstance(v, str) and v.strip()))
+
+    @api.model
+    def _lookup_external_ids(
+        self, system_id: int, values: list[str], resource: str | None = None, res_model: str | None = None
+    ) -> dict[str, Any]:
+        values = self._normalize_external_id_values(values)
+        if not values:
+            return {"records": {}, "archived": [], "missing": []}
+
+        domain = [("system_id", "=", system_id), ("external_id", "in", values)]
+        if resource:
+            domain.append(("resource", "=", resource))
+        if res_model:
+            domain.append(("res_model", "=", res_model))
+        rows = self.with_context(active_test=False).search_fetch(
+            domain, ["external_id", "res_model", "res_id", "active"], order="id"
+        )
+
+        refs: dict[str, tuple[str, int]] = {}
+        archived: set[str] = set()
+        for row in rows:
+            if row.active:
+                refs.setdefault(row.external_id, (row.res_model, row.res_id))
+            else:
+                archived.add(row.external_id)
+
+        # One existence check per target model instead of one per row
+        ids_by_model: dict[str, set[int]] = defaultdict(set)
+        for model_name, res_id in refs.values():
+            ids_by_model[model_name].add(res_id)
+        existing: dict[str, Any] = {}
+        for model_name, res_ids in ids_by_model.items():
+            if model_name in self.env:
+                existing[model_name] = self.env[model_name].browse(res_ids).exists()
+
+        records: dict[str, Any] = {}
+        for value in values:
+            model_name, res_id = refs.get(value, (None, None))
+            found = existing.get(model_name)
+            if found is not None and res_id in found._ids:
+                records[value] = found.browse(res_id).with_prefetch(found._ids)
+
+        return {
+            "records": records,
+            "archived": [v for v in values if v not in records and v in archived],
+            "missing": [v for v in values if v not in records and v not in archived],
+        }
+
+    @api.model
+    def _find_external_id_conflicts(
+        self, system_id: int, res_model: str, values_by_res_id: dict[int, str], resource: str = "default"
+    ) -> list[str]:
+        # Values already held by another record for this system/resource, which the upsert would violate
+        self.flush_model()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT external_id, res_model, res_id
+                  FROM external_id
+                 WHERE system_id = %s AND resource = %s AND external_id = ANY(%s)
+                """,
+                system_id,
+                resource,
+                list(values_by_res_id.values()),
+            )
+        )
+        return sorted(
+            value
+            for value, owner_model, owner_id in self.env.cr.fetchall()
+            if owner_model != res_model or values_by_res_id.get(owner_id) != value
+        )
+
+    @api.model
+    def _upsert_external_ids(
+        self, system: SystemInfo, res_model: str, values_by_res_id: dict[int, str], resource: str = "default"
+    ) -> dict[str, int]:
+        # Raw SQL below bypasses the ORM access checks: apply them before anything is written
+        self.check_access("create")
+        self.check_access("write")
+        counts = {"created": 0, "updated": 0, "unchanged": 0}
+        if not values_by_res_id:
+            return counts
+
+        Model = self.env[res_model]
+        existing = Model.with_context(active_test=False).browse(values_by_res_id).exists()
+        missing = sorted(set(values_by_res_id) - set(existing.ids))
+        if missing:
+            raise ValidationError(f"No {res_model} records with IDs: {', '.join(map(str, missing))}")
+
+        res_ids = list(values_by_res_id)
+        values = [(values_by_res_id[res_id] or "").strip() for res_id in res_ids]
+        if not all(values):
+            raise ValidationError("External IDs cannot be empty.")
+        duplicates = sorted(value for value, count in Counter(values).items() if count > 1)
+        if duplicates:
+            raise ValidationError(f"External IDs assigned to more than one record: {', '.join(duplicates)}")
+        invalid = system.get_invalid_external_ids(values)
+        if invalid:
+            raise ValidationError(self._invalid_format_message(system.name, system.id_format, invalid))
+
+        conflicts = self._find_external_id_conflicts(system.id, res_model, dict(zip(res_ids, values)), resource)
+        if conflicts:
+            raise ValidationError(
+                f"These external IDs already exist for this system and resource: {', '.join(conflicts)}"
+            )
+
+        company_ids: list[int | None] = [None] * len(res_ids)
+        if "company_id" in Model._fields:
+            companies = {record.id: record.company_id.id for record in existing}
+            company_ids = [companies.get(res_id) or None for res_id in res_ids]
+
+        cr = self.env.cr
+        # Values replaced by the upsert, so their lookup cache keys can be dropped too
+        cr.execute(
+            SQL(
+                """
+                SELECT res_id, external_id FROM external_id
+                 WHERE res_model = %s AND system_id = %s AND resource = %s AND res_id = ANY(%s)
+                """,
+                res_model,
+                system.id,
+                resource,
+                res_ids,
+            )
+        )
+        previous_values = dict(cr.fetchall())
+
+        now = fields.Datetime.now()
+        cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id (
+                    res_model, res_id, system_id, resource, external_id, active, company_id,
+                    create_uid, create_date, write_uid, write_date
+                )
+                SELECT %(res_model)s, v.res_id, %(system_id)s, %(resource)s, v.external_id, TRUE, v.company_id,
+                       %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM unnest(%(res_ids)s::int[], %(values)s::varchar[], %(company_ids)s::int[])
+                       AS v(res_id, external_id, company_id)
+                    ON CONFLICT (res_model, res_id, system_id, resource) DO UPDATE
+                   SET external_id = EXCLUDED.external_id,
+                       active = TRUE,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+                 WHERE external_id.external_id IS DISTINCT FROM EXCLUDED.external_id
+                    OR NOT external_id.active
+             RETURNING id, (xmax = 0), res_id
+                """,
+                res_model=res_model,
+                system_id=system.id,
+                resource=resource,
+                uid=self.env.uid,
+                now=now,
+                res_ids=res_ids,
+                values=values,
+                company_ids=company_ids,
+            )
+        )
+        changed = cr.fetchall()
+        ExternalIdChange = self.env["external.id.change"]
+        ExternalIdChange._record_changes("create", [row_id for row_id, created, _res_id in changed if created])
+        ExternalIdChange._record_changes("write", [row_id for row_id, created, _res_id in changed if not created])
+        counts["created"] = sum(1 for _id, created, _res_id in changed if created)
+        counts["updated"] = len(changed) - counts["created"]
+        counts["unchanged"] = len(res_ids) - len(changed)
 
-        return None
+        self.invalidate_model()
+        Model.invalidate_model(["external_ids"])
+        if changed:
+            new_values = dict(zip(res_ids, values))
+            changed_values = [new_values[res_id] for _id, _created, res_id in changed]
+            changed_values += [
+                previous_values[res_id] for _id, _created, res_id in changed if res_id in previous_values
+            ]
+            self._invalidate_lookup_cache(self._lookup_cache_keys_for(system.code, resource, changed_values))
+            self.env["external.id.promotion"]._refresh_promoted_columns(
+                {(res_model, res_id, system.id, resource) for _id, _created, res_id in changed}
+            )
+        return counts
 
     def name_search(
         self, name: str = "", args: list | None = None, operator: str = "ilike", limit: int = 80
@@ -266,14 +851,15 @@ class ExternalId(models.Model):
             return [(record.id, record.display_name or "") for record in records]
 
         name = name.strip()
+        dom = expression.AND([base, [("external_id", operator, name)]])
         if ":" in name:
             sys_part, _, ext_part = name.partition(":")
-            sys = sys_part.strip()
-            ext = ext_part.strip()
-            or_domain = [("system_id.name", "ilike", sys), ("system_id.code", "ilike", sys)]
-            dom = expression.AND([base, expression.OR([[d] for d in or_domain]), [("external_id", operator, ext)]])
-        else:
-            dom = expression.AND([base, [("external_id", operator, name)]])
+            # Resolved against the cached systems, so the search stays on external_id alone
+            system_ids = self.env["external.system"]._match_system_ids(sys_part)
+            if system_ids:
+                dom = expression.AND(
+                    [base, [("system_id", "in", system_ids), ("external_id", operator, ext_part.strip())]]
+                )
 
         records = self.search(dom, limit=limit)
         return [(record.id, record.display_name or "") for record in records]
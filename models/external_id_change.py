@@ -0,0 +1,253 @@
+import threading
+from datetime import timedelta
+from typing import Any
+
+from psycopg2 import errors
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+CHANGE_SEQUENCE = "external_id_change_seq_counter"
+# external_ids.change_retention_days / external_ids.change_compact_days only ever remove numbered
+# changes. A change is numbered once every transaction running on the PostgreSQL cluster started
+# after it, so any long transaction stalls the feed until it ends: pg_dump, a long report, a
+# transaction in another database, or a large import_external_ids, which runs as one transaction.
+DEFAULT_CHANGE_RETENTION_DAYS = 30
+
+
+class ExternalIdChange(models.Model):
+    _name = "external.id.change"
+    _description = "External ID Change Log"
+    _order = "id desc"
+    _rec_name = "external_id"
+
+    seq = fields.Integer(
+        readonly=True,
+        index=True,
+        help="Monotonic position in the change feed, assigned once the change is committed",
+    )
+    operation = fields.Selection(
+        [("create", "Created"), ("write", "Updated"), ("unlink", "Deleted")],
+        required=True,
+        readonly=True,
+    )
+    external_record_id = fields.Integer(string="External ID Record", readonly=True, index=True)
+    res_model = fields.Char(string="Model", readonly=True)
+    res_id = fields.Integer(string="Record ID", readonly=True)
+    system_id = fields.Many2one("external.system", string="External System", readonly=True, ondelete="set null")
+    system_code = fields.Char(readonly=True)
+    resource = fields.Char(readonly=True)
+    external_id = fields.Char(string="External ID", readonly=True)
+    active = fields.Boolean(readonly=True)
+
+    def init(self) -> None:
+        super().init()
+        # The writing transaction id decides feed order; it is filled in by PostgreSQL itself
+        self.env.cr.execute(
+            SQL(
+                "ALTER TABLE %s ADD COLUMN IF NOT EXISTS txid bigint NOT NULL DEFAULT txid_current()",
+                SQL.identifier(self._table),
+            )
+        )
+        self.env.cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(CHANGE_SEQUENCE)))
+        self.env.cr.execute(
+            SQL(
+                "CREATE INDEX IF NOT EXISTS external_id_change_pending_idx ON %s (txid, id) WHERE seq IS NULL",
+                SQL.identifier(self._table),
+            )
+        )
+
+    @api.model
+    def _record_changes(self, operation: str, external_record_ids: list[int]) -> None:
+        if not external_record_ids:
+            return
+        self.env["external.id"].flush_model()
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id_change (
+                    operation, external_record_id, res_model, res_id, system_id, system_code, resource,
+                    external_id, active, create_uid, create_date, write_uid, write_date
+                )
+                SELECT %(operation)s, e.id, e.res_model, e.res_id, e.system_id, s.code, e.resource,
+                       e.external_id, e.active, %(uid)s, %(now)s, %(uid)s, %(now)s
+                  FROM external_id e
+                  JOIN external_system s ON s.id = e.system_id
+                 WHERE e.id = ANY(%(ids)s)
+              ORDER BY e.id
+                """,
+                operation=operation,
+                uid=self.env.uid,
+                now=fields.Datetime.now(),
+                ids=list(external_record_ids),
+            )
+        )
+
+    @api.model
+    def _snapshot_changes(self, operation: str, external_record_ids: list[int]) -> list[tuple]:
+        # For deletes the rows are read up front and only logged once the delete went through
+        if not external_record_ids:
+            return []
+        self.env["external.id"].flush_model()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT %(operation)s, e.id, e.res_model, e.res_id, e.system_id, s.code, e.resource,
+                       e.external_id, e.active
+                  FROM external_id e
+                  JOIN external_system s ON s.id = e.system_id
+                 WHERE e.id = ANY(%(ids)s)
+              ORDER BY e.id
+                """,
+                operation=operation,
+                ids=list(external_record_ids),
+            )
+        )
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _insert_changes(self, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        now = fields.Datetime.now()
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id_change (
+                    operation, external_record_id, res_model, res_id, system_id, system_code, resource,
+                    external_id, active, create_uid, create_date, write_uid, write_date
+                )
+                VALUES %s
+                """,
+                SQL(", ").join(
+                    SQL(
+                        "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                        *row,
+                        self.env.uid,
+                        now,
+                        self.env.uid,
+                        now,
+                    )
+                    for row in rows
+                ),
+            )
+        )
+
+    @api.model
+    def _assign_sequence(self) -> None:
+        # Number committed changes in (txid, id) order, but only those written by transactions older
+        # than every transaction still running: a long import committing late can then never land
+        # behind a cursor a consumer has already moved past. Whoever holds the lock numbers for
+        # everyone, so the others skip instead of waiting.
+        self.env.cr.execute(SQL("SELECT pg_try_advisory_xact_lock(hashtext(%s))", CHANGE_SEQUENCE))
+        if not self.env.cr.fetchone()[0]:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH pending AS (
+                    SELECT id, row_number() OVER (ORDER BY txid, id) AS rn
+                      FROM external_id_change
+                     WHERE seq IS NULL AND txid < txid_snapshot_xmin(txid_current_snapshot())
+                ), base AS (
+                    SELECT nextval(%(sequence)s) - 1 AS value
+                      FROM (SELECT 1 FROM pending LIMIT 1) AS has_pending
+                ), numbered AS (
+                    UPDATE external_id_change c
+                       SET seq = base.value + pending.rn
+                      FROM pending, base
+                     WHERE c.id = pending.id
+                 RETURNING c.seq
+                )
+                SELECT setval(%(sequence)s, MAX(seq)) FROM numbered HAVING COUNT(*) > 0
+                """,
+                sequence=CHANGE_SEQUENCE,
+            )
+        )
+        self.invalidate_model(["seq"])
+
+    @api.model
+    def changes_since(self, seq: int = 0, limit: int = 1000) -> dict[str, Any]:
+        self.check_access("read")
+        self._assign_sequence_apart()
+        changes = self.search_fetch(
+            [("seq", ">", seq or 0)],
+            [
+                "seq",
+                "operation",
+                "external_record_id",
+                "res_model",
+                "res_id",
+                "system_code",
+                "resource",
+                "external_id",
+                "active",
+                "create_date",
+            ],
+            order="seq",
+            limit=limit,
+        )
+        return {
+            "changes": [
+                {
+                    "seq": change.seq,
+                    "operation": change.operation,
+                    "external_record_id": change.external_record_id,
+                    "res_model": change.res_model,
+                    "res_id": change.res_id,
+                    "system": change.system_code,
+                    "resource": change.resource,
+                    "external_id": change.external_id,
+                    "active": change.active,
+                    "date": fields.Datetime.to_string(change.create_date),
+                }
+                for change in changes
+            ],
+            "seq": changes[-1].seq if changes else seq or 0,
+        }
+
+    @api.model
+    def _assign_sequence_apart(self) -> None:
+        # Numbering writes, so it runs in its own short transaction: the reader's transaction stays
+        # read-only and concurrent consumers cannot hit serialization failures on the feed rows.
+        # Changes numbered after the reader's snapshot was taken show up on its next poll.
+        if getattr(threading.current_thread(), "testing", False):
+            self.sudo()._assign_sequence()
+            return
+        try:
+            with self.env.registry.cursor() as cr:
+                self.with_env(self.env(cr=cr, su=True))._assign_sequence()
+        except errors.SerializationFailure:
+            # Another consumer numbered the same changes first
+            pass
+
+    @api.autovacuum
+    def _gc_changes(self) -> None:
+        params = self.env["ir.config_parameter"].sudo()
+        retention_days = int(params.get_param("external_ids.change_retention_days", DEFAULT_CHANGE_RETENTION_DAYS))
+        compact_days = int(params.get_param("external_ids.change_compact_days", 0))
+        now = fields.Datetime.now()
+        self._assign_sequence()
+        if compact_days > 0:
+            # Keep only the latest change per external ID once changes are older than the window
+            self.env.cr.execute(
+                SQL(
+                    """
+                    DELETE FROM external_id_change c
+                     WHERE c.seq IS NOT NULL AND c.create_date < %s
+                       AND EXISTS (
+                           SELECT 1 FROM external_id_change n
+                            WHERE n.external_record_id = c.external_record_id AND n.seq > c.seq
+                       )
+                    """,
+                    now - timedelta(days=compact_days),
+                )
+            )
+        if retention_days > 0:
+            self.env.cr.execute(
+                SQL(
+                    "DELETE FROM external_id_change WHERE seq IS NOT NULL AND create_date < %s",
+                    now - timedelta(days=retention_days),
+                )
+            )
+        self.invalidate_model()
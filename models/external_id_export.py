@@ -0,0 +1,100 @@
+import csv
+import json
+import uuid
+from datetime import datetime
+from typing import IO
+from urllib.parse import urlencode
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+EXPORT_COLUMNS = ["res_model", "res_id", "system", "resource", "external_id", "last_sync"]
+
+
+class ExternalId(models.Model):
+    _inherit = "external.id"
+
+    @api.model
+    def export_external_ids(
+        self,
+        stream: IO[str],
+        file_format: str = "csv",
+        system_codes: list[str] | None = None,
+        res_models: list[str] | None = None,
+        last_sync_from: datetime | str | None = None,
+        last_sync_to: datetime | str | None = None,
+        include_archived: bool = False,
+        chunk_size: int = 10000,
+    ) -> int:
+        if file_format not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported export format '{file_format}'")
+        self.check_access("read")
+        self.flush_model()
+
+        conditions = [SQL("TRUE")]
+        if not include_archived:
+            conditions.append(SQL("e.active"))
+        if system_codes:
+            conditions.append(SQL("s.code = ANY(%s)", list(system_codes)))
+        if res_models:
+            conditions.append(SQL("e.res_model = ANY(%s)", list(res_models)))
+        if last_sync_from:
+            conditions.append(SQL("e.last_sync >= %s", fields.Datetime.to_datetime(last_sync_from)))
+        if last_sync_to:
+            conditions.append(SQL("e.last_sync < %s", fields.Datetime.to_datetime(last_sync_to)))
+        query = SQL(
+            """
+            SELECT e.res_model, e.res_id, s.code, e.resource, e.external_id, e.last_sync
+              FROM external_id e
+              JOIN external_system s ON s.id = e.system_id
+             WHERE %s
+          ORDER BY e.id
+            """,
+            SQL(" AND ").join(conditions),
+        )
+
+        writer = csv.writer(stream) if file_format == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+
+        # Server-side cursor: rows are fetched chunk by chunk instead of materialised in Python
+        cr = self.env.cr
+        cursor_name = SQL.identifier(f"external_id_export_{uuid.uuid4().hex}")
+        cr.execute(SQL("DECLARE %s NO SCROLL CURSOR FOR %s", cursor_name, query))
+        count = 0
+        while True:
+            cr.execute(SQL("FETCH FORWARD %s FROM %s", chunk_size, cursor_name))
+            rows = cr.fetchall()
+            if not rows:
+                break
+            for row in rows:
+                last_sync = row[5].isoformat(sep=" ") if row[5] else None
+                if writer:
+                    writer.writerow([*row[:5], last_sync or ""])
+                else:
+                    stream.write(json.dumps(dict(zip(EXPORT_COLUMNS, [*row[:5], last_sync]))) + "\n")
+            count += len(rows)
+        cr.execute(SQL("CLOSE %s", cursor_name))
+        return count
+
+    @api.model
+    def action_export_external_ids(
+        self,
+        file_format: str = "csv",
+        system_codes: list[str] | None = None,
+        res_models: list[str] | None = None,
+        last_sync_from: str | None = None,
+        last_sync_to: str | None = None,
+    ) -> "odoo.values.ir_actions_act_url":
+        params = {
+            "system": ",".join(system_codes or []),
+            "model": ",".join(res_models or []),
+            "since": last_sync_from or "",
+            "until": last_sync_to or "",
+        }
+        query = urlencode({key: value for key, value in params.items() if value})
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/external_ids/export/{file_format}" + (f"?{query}" if query else ""),
+            "target": "self",
+        }
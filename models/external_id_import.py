@@ -0,0 +1,173 @@
+import csv
+import io
+import json
+import logging
+from collections import Counter
+from collections.abc import Callable, Iterator
+from typing import IO, Any
+
+from odoo import api, models
+
+from .external_system import SystemInfo
+
+_logger = logging.getLogger(__name__)
+
+IMPORT_MAX_ERRORS = 1000
+
+
+class ExternalId(models.Model):
+    _inherit = "external.id"
+
+    @api.model
+    def import_external_ids(
+        self,
+        file: IO,
+        system_code: str,
+        res_model: str,
+        key_field: str,
+        resource: str | None = None,
+        file_format: str = "csv",
+        key_column: str = "key",
+        value_column: str = "external_id",
+        chunk_size: int = 5000,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        self.check_access("create")
+        self.check_access("write")
+        system = self.env["external.system"]._resolve_system(system_code)
+        if not system:
+            raise ValueError(f"External system with code '{system_code}' not found")
+        if res_model not in self._mixin_models():
+            raise ValueError(f"Model '{res_model}' does not support external IDs")
+        if key_field not in self.env[res_model]._fields:
+            raise ValueError(f"Model '{res_model}' has no field '{key_field}'")
+
+        report: dict[str, Any] = {
+            "processed": 0,
+            "created": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "error_count": 0,
+            "errors": [],
+        }
+        rows = self._iter_import_rows(file, file_format, key_column, value_column)
+        chunk: list[tuple[int, str, str]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                self._import_external_id_chunk(chunk, system, res_model, key_field, resource or "default", report)
+                chunk = []
+                self._report_import_progress(report, system_code, res_model, progress_callback)
+        if chunk:
+            self._import_external_id_chunk(chunk, system, res_model, key_field, resource or "default", report)
+            self._report_import_progress(report, system_code, res_model, progress_callback)
+        return report
+
+    @staticmethod
+    def _iter_import_rows(
+        file: IO, file_format: str, key_column: str, value_column: str
+    ) -> Iterator[tuple[int, str, str]]:
+        if isinstance(file.read(0), bytes):
+            file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, (row.get(key_column) or "").strip(), (row.get(value_column) or "").strip()
+        elif file_format == "jsonl":
+            for line_number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    row = None
+                if not isinstance(row, dict):
+                    yield line_number, "", ""
+                    continue
+                yield line_number, str(row.get(key_column) or "").strip(), str(row.get(value_column) or "").strip()
+        else:
+            raise ValueError(f"Unsupported import format '{file_format}'")
+
+    @staticmethod
+    def _add_import_error(report: dict[str, Any], line: int, key: str, message: str) -> None:
+        report["error_count"] += 1
+        if len(report["errors"]) < IMPORT_MAX_ERRORS:
+            report["errors"].append({"line": line, "key": key, "message": message})
+
+    @api.model
+    def _import_external_id_chunk(
+        self,
+        chunk: list[tuple[int, str, str]],
+        system: SystemInfo,
+        res_model: str,
+        key_field: str,
+        resource: str,
+        report: dict[str, Any],
+    ) -> None:
+        report["processed"] += len(chunk)
+        Model = self.env[res_model].with_context(active_test=False)
+
+        keys = {key for _line, key, _value in chunk if key}
+        if key_field == "id":
+            keys = {key for key in keys if key.isdigit()}
+            search_keys = [int(key) for key in keys]
+        else:
+            search_keys = list(keys)
+        ids_by_key: dict[str, list[int]] = {}
+        for record in Model.search_fetch([(key_field, "in", search_keys)], [key_field]):
+            ids_by_key.setdefault(str(record[key_field]), []).append(record.id)
+
+        invalid = set(system.get_invalid_external_ids([value for _line, _key, value in chunk if value]))
+        value_counts = Counter(value for _line, _key, value in chunk if value)
+        candidates: dict[int, tuple[int, str, str]] = {}
+        for line, key, value in chunk:
+            matches = ids_by_key.get(key, [])
+            if not key or not value:
+                self._add_import_error(report, line, key, "Missing key or external ID")
+            elif not matches:
+                self._add_import_error(report, line, key, f"No {res_model} found with {key_field} = {key!r}")
+            elif len(matches) > 1:
+                self._add_import_error(report, line, key, f"Several {res_model} records match {key_field} = {key!r}")
+            elif value in invalid:
+                self._add_import_error(
+                    report, line, key, self._invalid_format_message(system.name, system.id_format, [value])
+                )
+            elif value_counts[value] > 1:
+                self._add_import_error(report, line, key, f"External ID {value!r} appears more than once in the file")
+            elif matches[0] in candidates:
+                self._add_import_error(report, line, key, f"Record {key!r} appears more than once in the file")
+            else:
+                candidates[matches[0]] = (line, key, value)
+
+        values_by_res_id = {res_id: value for res_id, (_line, _key, value) in candidates.items()}
+        conflicts = set(self._find_external_id_conflicts(system.id, res_model, values_by_res_id, resource))
+        for res_id, (line, key, value) in list(candidates.items()):
+            if value in conflicts:
+                self._add_import_error(report, line, key, f"External ID {value!r} already belongs to another record")
+                del values_by_res_id[res_id]
+
+        counts = self._upsert_external_ids(system, res_model, values_by_res_id, resource)
+        for name, count in counts.items():
+            report[name] += count
+        # Keep the environment cache from growing with the size of the file
+        self.env.invalidate_all()
+
+    @api.model
+    def _report_import_progress(
+        self,
+        report: dict[str, Any],
+        system_code: str,
+        res_model: str,
+        progress_callback: Callable[[dict[str, Any]], None] | None,
+    ) -> None:
+        _logger.info(
+            "External ID import %s/%s: %s rows processed, %s created, %s updated, %s errors",
+            system_code,
+            res_model,
+            report["processed"],
+            report["created"],
+            report["updated"],
+            report["error_count"],
+        )
+        if progress_callback:
+            progress_callback(report)
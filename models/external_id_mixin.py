@@ -1,21 +1,140 @@
-from typing import Self
+from typing import Any, Self
 
 from odoo import api, models, fields
+from odoo.tools import SQL
+
+from .call_stats import instrumented
+from .external_system import SystemInfo
+from .external_system_url import UrlRenderer
 
 
 class ExternalIdMixin(models.AbstractModel):
     _name = "external.id.mixin"
     _description = "External ID Mixin"
 
-    external_ids = fields.One2many("external.id", "res_id", string="External IDs")
+    external_ids = fields.One2many(
+        "external.id",
+        "res_id",
+        string="External IDs",
+        domain=lambda self: [("res_model", "=", self._name)],
+    )
+    has_external_id = fields.Boolean(
+        compute="_compute_external_id_filters", search="_search_has_external_id", string="Has External ID"
+    )
+    external_system_codes = fields.Char(
+        compute="_compute_external_id_filters",
+        search="_search_external_system_codes",
+        string="External Systems",
+        help="Codes of the systems this record has an active external ID in",
+    )
+    external_id_value = fields.Char(
+        compute="_compute_external_id_filters",
+        search="_search_external_id_value",
+        string="External ID",
+        help="Search by external ID, optionally scoped to a system as 'code:value' (e.g. ebay:1234)",
+    )
+
+    def _compute_external_id_filters(self) -> None:
+        rows = self.env["external.id"].search_fetch(
+            [("res_model", "=", self._name), ("res_id", "in", self._origin.ids)],
+            ["res_id", "system_id", "external_id"],
+            order="system_id, id",
+        )
+        values_by_res_id: dict[int, list[tuple[str, str]]] = {}
+        for row in rows:
+            values_by_res_id.setdefault(row.res_id, []).append((row.system_id.code, row.external_id))
+        for record in self:
+            values = values_by_res_id.get(record._origin.id, [])
+            record.has_external_id = bool(values)
+            record.external_system_codes = ", ".join(dict.fromkeys(code for code, _value in values))
+            record.external_id_value = ", ".join(f"{code}:{value}" for code, value in values)
+
+    def _external_id_subquery(self, condition: SQL | None = None) -> SQL:
+        # Served by the unique_record_per_system_resource index (or the value indexes when filtering on external_id)
+        return SQL(
+            "SELECT res_id FROM external_id WHERE res_model = %s AND active AND %s",
+            self._name,
+            condition or SQL("TRUE"),
+        )
+
+    def _search_has_external_id(self, operator: str, value: Any) -> list:
+        if operator not in ("=", "!="):
+            raise ValueError(f"Unsupported operator '{operator}' for has_external_id")
+        positive = (operator == "=") == bool(value)
+        return [("id", "in" if positive else "not in", self._external_id_subquery())]
+
+    def _search_external_system_codes(self, operator: str, value: Any) -> list:
+        if value is False or value is None:
+            return self._search_has_external_id("!=" if operator == "=" else "=", True)
+        if operator in ("=", "!=", "in", "not in"):
+            System = self.env["external.system"]
+            codes = [value] if isinstance(value, str) else list(value)
+            systems = [System._resolve_system(code) for code in codes]
+            condition = SQL("system_id = ANY(%s)", [system.id for system in systems if system])
+        elif operator in ("ilike", "not ilike"):
+            condition = SQL(
+                "system_id IN (SELECT id FROM external_system WHERE active AND code ILIKE %s)", f"%{value}%"
+            )
+        else:
+            raise ValueError(f"Unsupported operator '{operator}' for external_system_codes")
+        negative = operator in ("!=", "not in", "not ilike")
+        return [("id", "not in" if negative else "in", self._external_id_subquery(condition))]
+
+    def _search_external_id_value(self, operator: str, value: Any) -> list:
+        if value is False or value is None:
+            return self._search_has_external_id("!=" if operator == "=" else "=", True)
+        if operator in ("=", "!=", "in", "not in"):
+            conditions = []
+            for text in [value] if isinstance(value, str) else list(value):
+                system_id, external_id = self._parse_external_id_filter(text)
+                if system_id:
+                    conditions.append(SQL("(system_id = %s AND external_id = %s)", system_id, external_id))
+                else:
+                    conditions.append(SQL("external_id = %s", external_id))
+            condition = SQL("(%s)", SQL(" OR ").join(conditions)) if conditions else SQL("FALSE")
+        elif operator in ("ilike", "not ilike"):
+            system_id, external_id = self._parse_external_id_filter(value)
+            condition = SQL("external_id ILIKE %s", f"%{external_id}%")
+            if system_id:
+                condition = SQL("system_id = %s AND %s", system_id, condition)
+        else:
+            raise ValueError(f"Unsupported operator '{operator}' for external_id_value")
+        negative = operator in ("!=", "not in", "not ilike")
+        return [("id", "not in" if negative else "in", self._external_id_subquery(condition))]
+
+    def unlink(self) -> bool:
+        # Cached reverse lookups point at the host without re-checking that it still exists;
+        # hosts removed outside the ORM only drop out of the cache with the TTL
+        ExternalId = self.env["external.id"]
+        external_ids = ExternalId.sudo().search([("res_model", "=", self._name), ("res_id", "in", self.ids)])
+        keys = external_ids._get_lookup_cache_keys()
+        result = super().unlink()
+        if keys:
+            ExternalId._invalidate_lookup_cache(keys)
+        return result
+
+    @api.model
+    def _parse_external_id_filter(self, text: str) -> tuple[int | None, str]:
+        # "ebay:1234" targets one system; values without a known system code match every system
+        code, separator, external_id = str(text).partition(":")
+        system = self.env["external.system"]._resolve_system(code.strip()) if separator else None
+        if system:
+            return system.id, external_id.strip()
+        return None, str(text).strip()
 
+    @instrumented
     def get_external_system_id(self, system_code: str, resource: str | None = None) -> str | None:
         self.ensure_one()
         ExternalId = self.env["external.id"]
         System = self.env["external.system"]
-        system = System.search([("code", "=", system_code)], limit=1)
+        system = System._resolve_system(system_code)
         if not system:
             return None
+        promoted_field = self.env["external.id.promotion"]._get_promoted_field(
+            system.id, self._name, resource or "default"
+        )
+        if promoted_field:
+            return self[promoted_field] or None
         dom = [
             ("res_model", "=", self._name),
             ("res_id", "=", self.id),
@@ -32,12 +151,13 @@ class ExternalIdMixin(models.AbstractModel):
         )
         return rec.external_id if rec else None
 
+    @instrumented
     def set_external_id(self, system_code: str, external_id_value: str, resource: str | None = None) -> bool:
         self.ensure_one()
         ExternalId = self.env["external.id"]
         System = self.env["external.system"]
 
-        system = System.search([("code", "=", system_code)], limit=1)
+        system = System._resolve_system(system_code)
         if not system:
             raise ValueError(f"External system with code '{system_code}' not found")
 
@@ -74,11 +194,34 @@ class ExternalIdMixin(models.AbstractModel):
         return True
 
     @api.model
+    @instrumented
+    def set_external_ids(
+        self, system_code: str, mapping: "dict[int | Self, str]", resource: str | None = None
+    ) -> dict[str, int]:
+        System = self.env["external.system"]
+
+        system = System._resolve_system(system_code)
+        if not system:
+            raise ValueError(f"External system with code '{system_code}' not found")
+
+        values_by_res_id: dict[int, str] = {}
+        for record, external_id_value in mapping.items():
+            if isinstance(record, models.BaseModel):
+                record.ensure_one()
+                record = record.id
+            values_by_res_id[int(record)] = (external_id_value or "").strip()
+
+        return self.env["external.id"]._upsert_external_ids(
+            system, self._name, values_by_res_id, resource or "default"
+        )
+
+    @api.model
+    @instrumented
     def search_by_external_id(self, system_code: str, external_id_value: str, resource: str | None = None) -> Self:
         ExternalId = self.env["external.id"]
         System = self.env["external.system"]
 
-        system = System.search([("code", "=", system_code)], limit=1)
+        system = System._resolve_system(system_code)
         if not system:
             return self.browse()
 
@@ -100,6 +243,23 @@ class ExternalIdMixin(models.AbstractModel):
             return self.browse(external_id_record.res_id)
         return self.browse()
 
+    @api.model
+    @instrumented
+    def search_by_external_ids(
+        self, system_code: str, external_id_values: list[str], resource: str | None = None
+    ) -> dict[str, Any]:
+        ExternalId = self.env["external.id"]
+        System = self.env["external.system"]
+
+        system = System._resolve_system(system_code)
+        if not system:
+            missing = ExternalId._normalize_external_id_values(external_id_values)
+            return {"records": {}, "archived": [], "missing": missing}
+
+        return ExternalId._lookup_external_ids(
+            system.id, external_id_values, resource or "default", res_model=self._name
+        )
+
     def action_view_external_ids(self) -> "odoo.values.ir_actions_act_window":
         self.ensure_one()
         return {
@@ -123,56 +283,85 @@ class ExternalIdMixin(models.AbstractModel):
         m = re.search(r"/(\d+)$", external_id_value or "")
         return m.group(1) if m else (external_id_value or "")
 
-    def get_external_url(self, system_code: str, kind: str = "store", resource: str | None = None) -> str | None:
-        self.ensure_one()
+    @instrumented
+    def get_external_system_ids(self, system_code: str, resource: str | None = None) -> dict[int, str]:
+        ExternalId = self.env["external.id"]
         System = self.env["external.system"]
-        SystemUrl = self.env["external.system.url"]
 
-        system = System.search([("code", "=", system_code)], limit=1)
-        if not system:
-            return None
-        # Prefer dynamic templates; fallback to legacy fields
-        template = None
-        url_dom = [
-            ("system_id", "=", system.id),
-            ("code", "=", kind),
-            ("active", "=", True),
-            "|",
-            ("res_model_id", "=", False),
-            ("res_model_id.model", "=", self._name),
-        ]
-        # If the template defines a resource, prefer that; otherwise we will use given/default resource.
-        urls = SystemUrl.search(
-            [*url_dom],
-            order="res_model_id desc, sequence, id",
-            limit=1,
+        system = System._resolve_system(system_code)
+        if not system or not self.ids:
+            return {}
+        promoted_field = self.env["external.id.promotion"]._get_promoted_field(
+            system.id, self._name, resource or "default"
+        )
+        if promoted_field:
+            # Single-table read from the host column kept in sync with external.id; ids of deleted
+            # records are skipped like on the external.id path
+            records = self.with_context(active_test=False).search_fetch([("id", "in", self.ids)], [promoted_field])
+            return {record.id: record[promoted_field] for record in records if record[promoted_field]}
+        rows = ExternalId.search_fetch(
+            [
+                ("res_model", "=", self._name),
+                ("res_id", "in", self.ids),
+                ("system_id", "=", system.id),
+                ("resource", "=", resource or "default"),
+            ],
+            ["res_id", "external_id"],
         )
-        if urls:
-            template = urls.template
-        elif kind in {"store", "admin"}:  # legacy compatibility
+        return {row.res_id: row.external_id for row in rows}
+
+    @api.model
+    def _get_external_url_renderer(self, system: SystemInfo, kind: str) -> UrlRenderer | None:
+        System = self.env["external.system"]
+        SystemUrl = self.env["external.system.url"]
+
+        # Prefer dynamic templates (cached per system/code/model); fallback to legacy fields
+        renderer = SystemUrl._get_url_renderer(system.id, kind, self._name)
+        if renderer:
+            return renderer
+        if kind in {"store", "admin"}:  # legacy compatibility
             field_name = "store_url_template" if kind == "store" else "admin_url_template"
-            template = getattr(system, field_name)
-        if not template:
-            return None
+            if field_name in System._fields and System.browse(system.id)[field_name]:
+                return UrlRenderer.parse(System.browse(system.id)[field_name])
+        return None
 
-        # Determine which resource to use for ID lookup
-        res_key = resource or getattr(urls, "resource", False) or "default"
-        ext_id = self.get_external_system_id(system_code, res_key)
-        if not ext_id:
-            return None
+    @instrumented
+    def get_external_urls(self, system_code: str, kind: str = "store", resource: str | None = None) -> dict[int, str]:
+        System = self.env["external.system"]
 
-        tokens = {
-            "id": self._extract_numeric_id(ext_id),
-            "gid": ext_id,
-            "model": self._name,
-            "name": self.display_name,
-            "code": system.code,
-            "base": system.url or "",
-        }
-        try:
-            return template.format(**tokens)
-        except Exception:
-            return None
+        system = System._resolve_system(system_code)
+        if not system or not self:
+            return {}
+        # The template is chosen once for the model, and IDs are fetched for the whole recordset
+        renderer = self._get_external_url_renderer(system, kind)
+        if not renderer:
+            return {}
+        # If the template defines a resource, prefer that; otherwise use the given/default resource.
+        ext_ids = self.get_external_system_ids(system_code, resource or renderer.resource or "default")
+
+        urls: dict[int, str] = {}
+        for record in self:
+            ext_id = ext_ids.get(record.id)
+            if not ext_id:
+                continue
+            tokens = {
+                "id": self._extract_numeric_id(ext_id),
+                "gid": ext_id,
+                "model": self._name,
+                "name": record.display_name if "name" in renderer.tokens else "",
+                "code": system.code,
+                "base": system.url,
+            }
+            try:
+                urls[record.id] = renderer.render(tokens)
+            except Exception:
+                continue
+        return urls
+
+    @instrumented
+    def get_external_url(self, system_code: str, kind: str = "store", resource: str | None = None) -> str | None:
+        self.ensure_one()
+        return self.get_external_urls(system_code, kind, resource).get(self.id)
 
     def action_open_external_url(self) -> "odoo.values.ir_actions_act_url | odoo.values.ir_actions_client":
         self.ensure_one()
@@ -0,0 +1,140 @@
+import re
+from collections import defaultdict
+
+from odoo import api, fields, models, tools
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+PromotionTarget = tuple[str, int, int, str]
+
+
+class ExternalIdPromotion(models.Model):
+    _name = "external.id.promotion"
+    _description = "Promoted External ID Column"
+    _order = "system_id, model_id, resource"
+
+    system_id = fields.Many2one("external.system", string="External System", required=True, ondelete="restrict")
+    model_id = fields.Many2one("ir.model", string="Model", required=True, ondelete="cascade")
+    res_model = fields.Char(related="model_id.model", string="Model Name")
+    resource = fields.Char(required=True, default="default")
+    field_id = fields.Many2one("ir.model.fields", string="Promoted Field", readonly=True, ondelete="cascade")
+    field_name = fields.Char(related="field_id.name")
+
+    _sql_constraints = [
+        (
+            "promotion_unique",
+            "UNIQUE(system_id, model_id, resource)",
+            "An external ID can only be promoted once per system, model and resource!",
+        ),
+    ]
+
+    @api.constrains("model_id")
+    def _check_model_id(self) -> None:
+        mixin_models = self.env["external.id"]._mixin_models()
+        for promotion in self:
+            if promotion.model_id.model not in mixin_models:
+                raise ValidationError(f"Model '{promotion.model_id.model}' does not use external IDs.")
+
+    @api.model_create_multi
+    def create(self, vals_list: "list[odoo.values.external_id_promotion]") -> "odoo.model.external_id_promotion":
+        promotions = super().create(vals_list)
+        for promotion in promotions:
+            promotion.field_id = self.env["ir.model.fields"].sudo().create(promotion._prepare_field_values())
+        self.env.registry.clear_cache()
+        for promotion in promotions:
+            promotion._update_promoted_column()
+        return promotions
+
+    def write(self, vals: "odoo.values.external_id_promotion") -> bool:
+        if {"system_id", "model_id", "resource"}.intersection(vals):
+            raise ValidationError("Remove the promotion and create a new one to promote another external ID.")
+        return super().write(vals)
+
+    def unlink(self) -> bool:
+        promoted_fields = self.field_id
+        result = super().unlink()
+        promoted_fields.sudo().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    def _prepare_field_values(self) -> "odoo.values.ir_model_fields":
+        self.ensure_one()
+        suffix = "" if self.resource == "default" else f"_{self.resource}"
+        name = re.sub(r"[^a-z0-9_]", "_", f"x_ext_{self.system_id.code}{suffix}".lower())[:63]
+        return {
+            "name": name,
+            "model_id": self.model_id.id,
+            "field_description": f"{self.system_id.name} ID" + (f" ({self.resource})" if suffix else ""),
+            "ttype": "char",
+            "store": True,
+            "readonly": True,
+            "index": True,
+            "copied": False,
+        }
+
+    @api.model
+    @tools.ormcache()
+    def _get_promotions(self) -> dict[tuple[int, str, str], str]:
+        return {
+            (promotion.system_id.id, promotion.res_model, promotion.resource): promotion.field_name
+            for promotion in self.sudo().search([("field_id", "!=", False)])
+        }
+
+    @api.model
+    def _get_promoted_field(self, system_id: int, res_model: str, resource: str) -> str | None:
+        return self._get_promotions().get((system_id, res_model, resource))
+
+    @api.model
+    def _refresh_promoted_columns(self, targets: set[PromotionTarget]) -> None:
+        promotions = self._get_promotions()
+        res_ids_by_key: dict[tuple[int, str, str], set[int]] = defaultdict(set)
+        for res_model, res_id, system_id, resource in targets:
+            if (system_id, res_model, resource) in promotions and res_id:
+                res_ids_by_key[system_id, res_model, resource].add(res_id)
+        if not res_ids_by_key:
+            return
+        self.env["external.id"].flush_model()
+        for (system_id, res_model, resource), res_ids in res_ids_by_key.items():
+            self._update_column(promotions[system_id, res_model, resource], system_id, res_model, resource, res_ids)
+
+    def _update_promoted_column(self) -> None:
+        self.ensure_one()
+        self.env["external.id"].flush_model()
+        self._update_column(self.field_name, self.system_id.id, self.res_model, self.resource)
+
+    @api.model
+    def _update_column(
+        self, field_name: str, system_id: int, res_model: str, resource: str, res_ids: set[int] | None = None
+    ) -> None:
+        # external.id stays the source of truth; the host column is only ever rewritten from it
+        Model = self.env[res_model]
+        if res_ids is None:
+            where = SQL(
+                "host.id IN (SELECT res_id FROM external_id "
+                "WHERE res_model = %s AND system_id = %s AND resource = %s AND active)",
+                res_model,
+                system_id,
+                resource,
+            )
+        else:
+            where = SQL("host.id = ANY(%s)", list(res_ids))
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE %(table)s host
+                   SET %(column)s = (
+                       SELECT e.external_id FROM external_id e
+                        WHERE e.res_model = %(res_model)s AND e.res_id = host.id AND e.system_id = %(system_id)s
+                          AND e.resource = %(resource)s AND e.active
+                   )
+                 WHERE %(where)s
+                """,
+                table=SQL.identifier(Model._table),
+                column=SQL.identifier(field_name),
+                res_model=res_model,
+                system_id=system_id,
+                resource=resource,
+                where=where,
+            )
+        )
+        Model.invalidate_model([field_name])
@@ -0,0 +1,230 @@
+import functools
+import logging
+import threading
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 5000
+ORPHAN_ACTION_PARAM = "external_ids.orphan_action"
+
+
+class ExternalId(models.Model):
+    _inherit = "external.id"
+
+    @api.model
+    def archive_system_ids(
+        self,
+        system: "str | odoo.model.external_system",
+        model: str | None = None,
+        resource: str | None = None,
+        older_than: datetime | str | None = None,
+        active: bool = False,
+        batch_size: int = PURGE_BATCH_SIZE,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        self.check_access("write")
+        condition = SQL(
+            "%s AND active = %s", self._get_system_scope(system, model, resource, older_than), not active
+        )
+        report = {"processed": 0, "archived": 0, "unarchived": 0, "deleted": 0, "skipped": 0}
+        return self._process_in_batches(
+            condition, lambda ids: self._set_active_batch(ids, active, report), batch_size, report, progress_callback
+        )
+
+    @api.model
+    def purge_system_ids(
+        self,
+        system: "str | odoo.model.external_system",
+        model: str | None = None,
+        resource: str | None = None,
+        older_than: datetime | str | None = None,
+        batch_size: int = PURGE_BATCH_SIZE,
+        progress_callback: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        self.check_access("unlink")
+        # Batches archive through a raw UPDATE, which needs write access too
+        self.check_access("write")
+        condition = self._get_system_scope(system, model, resource, older_than)
+        report = {"processed": 0, "archived": 0, "unarchived": 0, "deleted": 0, "skipped": 0}
+        return self._process_in_batches(
+            condition, lambda ids: self._purge_batch(ids, report), batch_size, report, progress_callback
+        )
+
+    @api.model
+    def cleanup_orphan_external_ids(
+        self, action: str | None = None, batch_size: int = PURGE_BATCH_SIZE
+    ) -> dict[str, dict[str, Any]]:
+        action = action or self.env["ir.config_parameter"].sudo().get_param(ORPHAN_ACTION_PARAM) or "archive"
+        if action not in ("archive", "delete"):
+            raise ValueError(f"Unsupported orphan action '{action}'")
+        self.check_access("unlink" if action == "delete" else "write")
+        self.flush_model()
+        self.env.cr.execute(SQL("SELECT DISTINCT res_model FROM external_id"))
+        reports = {}
+        for (res_model,) in self.env.cr.fetchall():
+            condition = self._get_orphan_condition(res_model)
+            if condition is None:
+                continue
+            report = {"processed": 0, "archived": 0, "unarchived": 0, "deleted": 0, "skipped": 0}
+            if action == "delete":
+                handler = functools.partial(self._purge_batch, report=report)
+            else:
+                condition = SQL("%s AND active", condition)
+                handler = functools.partial(self._set_active_batch, active=False, report=report)
+            reports[res_model] = self._process_in_batches(condition, handler, batch_size, report, None)
+        return reports
+
+    @api.model
+    def _get_orphan_condition(self, res_model: str) -> SQL | None:
+        # Rows of a model that is gone from the registry are all orphans
+        if res_model not in self.env or self.env[res_model]._abstract:
+            return SQL("res_model = %s", res_model)
+        Model = self.env[res_model]
+        if not Model._auto:
+            return None
+        # Anti-join on the host primary key; batches walk external_id by id so each row is probed once
+        return SQL(
+            "res_model = %s AND NOT EXISTS (SELECT 1 FROM %s host WHERE host.id = external_id.res_id)",
+            res_model,
+            SQL.identifier(Model._table),
+        )
+
+    @api.model
+    def _cron_cleanup_orphans(self) -> None:
+        for res_model, report in self.cleanup_orphan_external_ids().items():
+            if report["processed"]:
+                _logger.info("Cleaned up %s orphaned external IDs of %s", report["processed"], res_model)
+
+    @api.model
+    def _get_system_scope(
+        self,
+        system: "str | odoo.model.external_system",
+        model: str | None,
+        resource: str | None,
+        older_than: datetime | str | None,
+    ) -> SQL:
+        # Archived systems are accepted: decommissioned marketplaces are the main use case
+        code = system if isinstance(system, str) else system.code
+        info = self.env["external.system"]._get_system_info(code)
+        if not info:
+            raise ValueError(f"External system with code '{code}' not found")
+        conditions = [SQL("system_id = %s", info.id)]
+        if model:
+            conditions.append(SQL("res_model = %s", model))
+        if resource:
+            conditions.append(SQL("resource = %s", resource))
+        if older_than:
+            # Never-synced IDs age from their creation
+            conditions.append(
+                SQL("COALESCE(last_sync, create_date) < %s", fields.Datetime.to_datetime(older_than))
+            )
+        return SQL(" AND ").join(conditions)
+
+    @api.model
+    def _process_in_batches(
+        self,
+        condition: SQL,
+        handler: Callable[[list[int]], None],
+        batch_size: int,
+        report: dict[str, Any],
+        progress_callback: Callable[[dict[str, Any]], None] | None,
+    ) -> dict[str, Any]:
+        # Short transactions over id-ordered batches: rows locked by a running request are skipped
+        # instead of waited on, and each commit releases the locks taken by the batch.
+        self.flush_model()
+        cr = self.env.cr
+        last_id = 0
+        while True:
+            cr.execute(
+                SQL(
+                    """
+                    SELECT id FROM external_id
+                     WHERE id > %s AND %s
+                  ORDER BY id
+                     LIMIT %s
+                       FOR UPDATE SKIP LOCKED
+                    """,
+                    last_id,
+                    condition,
+                    batch_size,
+                )
+            )
+            ids = [row[0] for row in cr.fetchall()]
+            if not ids:
+                break
+            last_id = ids[-1]
+            handler(ids)
+            report["processed"] += len(ids)
+            if not getattr(threading.current_thread(), "testing", False):
+                cr.commit()
+            _logger.info(
+                "External ID maintenance: %s processed, %s archived, %s unarchived, %s deleted",
+                report["processed"],
+                report["archived"],
+                report["unarchived"],
+                report["deleted"],
+            )
+            if progress_callback:
+                progress_callback(report)
+            self.env.invalidate_all()
+        # Rows that were locked when the walk passed them are still in scope: report them so the
+        # caller can tell the run was incomplete and run it again
+        cr.execute(SQL("SELECT COUNT(*) FROM external_id WHERE %s", condition))
+        report["skipped"] = cr.fetchone()[0]
+        if report["skipped"]:
+            _logger.warning("External ID maintenance skipped %s locked rows", report["skipped"])
+        return report
+
+    @api.model
+    def _set_active_batch(self, ids: list[int], active: bool, report: dict[str, Any]) -> None:
+        records = self.browse(ids).with_context(active_test=False)
+        keys = records._get_lookup_cache_keys()
+        targets = records._get_promotion_targets()
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE external_id SET active = %s, write_uid = %s, write_date = %s
+                 WHERE id = ANY(%s) AND active <> %s
+             RETURNING id, res_model
+                """,
+                active,
+                self.env.uid,
+                fields.Datetime.now(),
+                ids,
+                active,
+            )
+        )
+        changed = self.env.cr.fetchall()
+        report["unarchived" if active else "archived"] += len(changed)
+        self.env["external.id.change"]._record_changes("write", [row_id for row_id, _res_model in changed])
+        self._after_bulk_change(keys, targets, {res_model for _row_id, res_model in changed})
+
+    @api.model
+    def _purge_batch(self, ids: list[int], report: dict[str, Any]) -> None:
+        # Same rule as _unlink_except_active: rows are archived before they are deleted
+        self._set_active_batch(ids, False, report)
+        self.env["external.id.change"]._record_changes("unlink", ids)
+        self.env.cr.execute(
+            SQL("DELETE FROM external_id WHERE id = ANY(%s) AND NOT active RETURNING res_model", ids)
+        )
+        rows = self.env.cr.fetchall()
+        report["deleted"] += len(rows)
+        self._after_bulk_change(set(), set(), {row[0] for row in rows})
+
+    @api.model
+    def _after_bulk_change(
+        self, keys: set[tuple[str, str | None, str]], targets: set[tuple[str, int, int, str]], res_models: set[str]
+    ) -> None:
+        self.invalidate_model()
+        for res_model in res_models:
+            if res_model in self.env and "external_ids" in self.env[res_model]._fields:
+                self.env[res_model].invalidate_model(["external_ids"])
+        if keys:
+            self._invalidate_lookup_cache(keys)
+        self.env["external.id.promotion"]._refresh_promoted_columns(targets)
@@ -0,0 +1,102 @@
+import logging
+
+from odoo import SUPERUSER_ID, api, fields, models
+from odoo.tools import SQL
+
+from .call_stats import CallKey, CallStats
+
+_logger = logging.getLogger(__name__)
+
+
+class ExternalIdStats(models.Model):
+    _name = "external.id.stats"
+    _description = "External ID API Call Statistics"
+    _order = "date desc, query_count desc"
+    _rec_name = "method"
+
+    date = fields.Date(required=True, readonly=True, index=True)
+    method = fields.Char(required=True, readonly=True)
+    res_model = fields.Char(string="Calling Model", required=True, readonly=True)
+    system_code = fields.Char(string="System", readonly=True)
+    calls = fields.Integer(readonly=True)
+    query_count = fields.Integer(string="Queries", readonly=True)
+    total_time = fields.Float(string="Total Time (s)", readonly=True, digits=(16, 3))
+    queries_per_call = fields.Float(compute="_compute_per_call", digits=(16, 2))
+    time_per_call = fields.Float(string="Time per Call (ms)", compute="_compute_per_call", digits=(16, 2))
+
+    _sql_constraints = [
+        (
+            "bucket_unique",
+            "UNIQUE(date, method, res_model, system_code)",
+            "Call statistics are aggregated once per day, method, model and system!",
+        ),
+    ]
+
+    @api.depends("calls", "query_count", "total_time")
+    def _compute_per_call(self) -> None:
+        for stats in self:
+            stats.queries_per_call = stats.query_count / stats.calls if stats.calls else 0.0
+            stats.time_per_call = stats.total_time * 1000 / stats.calls if stats.calls else 0.0
+
+    @api.model
+    def _flush_call_stats(self, stats: CallStats) -> None:
+        entries = stats.drain()
+        if not entries:
+            return
+        # Own transaction: the statistics survive a rollback of the instrumented request
+        try:
+            with self.env.registry.cursor() as cr:
+                api.Environment(cr, SUPERUSER_ID, {})["external.id.stats"]._merge_call_stats(entries)
+        except Exception:
+            _logger.warning("Could not flush external ID call statistics", exc_info=True)
+
+    @api.model
+    def _merge_call_stats(self, entries: dict[CallKey, list]) -> None:
+        if not entries:
+            return
+        # Keys differing only in a missing system code share a row; one INSERT may not touch it twice
+        merged: dict[CallKey, list] = {}
+        for (method, res_model, system_code), (calls, queries, duration) in entries.items():
+            entry = merged.setdefault((method, res_model, system_code or ""), [0, 0, 0.0])
+            entry[0] += calls
+            entry[1] += queries
+            entry[2] += duration
+        self.flush_model()
+        today = fields.Date.context_today(self)
+        now = fields.Datetime.now()
+        rows = SQL(", ").join(
+            SQL(
+                "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                today,
+                method,
+                res_model,
+                system_code,
+                calls,
+                queries,
+                duration,
+                self.env.uid,
+                now,
+                self.env.uid,
+                now,
+            )
+            for (method, res_model, system_code), (calls, queries, duration) in merged.items()
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id_stats (
+                    date, method, res_model, system_code, calls, query_count, total_time,
+                    create_uid, create_date, write_uid, write_date
+                )
+                VALUES %s
+                ON CONFLICT (date, method, res_model, system_code) DO UPDATE
+                   SET calls = external_id_stats.calls + EXCLUDED.calls,
+                       query_count = external_id_stats.query_count + EXCLUDED.query_count,
+                       total_time = external_id_stats.total_time + EXCLUDED.total_time,
+                       write_uid = EXCLUDED.write_uid,
+                       write_date = EXCLUDED.write_date
+                """,
+                rows,
+            )
+        )
+        self.invalidate_model()
@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.sql import create_index
+
+_logger = logging.getLogger(__name__)
+
+CRON_TIME_BUDGET = 50
+RATE_LIMIT_WINDOW = 60
+DONE_JOB_RETENTION_DAYS = 7
+BATCH_START_TABLE = "external_sync_batch_start"
+SYNC_CRON_XMLID = "external_ids.ir_cron_external_sync_jobs"
+
+
+class ExternalSyncJob(models.Model):
+    _name = "external.sync.job"
+    _description = "External ID Sync Job"
+    _order = "next_attempt_at, id"
+    _rec_name = "external_id_id"
+
+    external_id_id = fields.Many2one("external.id", string="External ID", required=True, ondelete="cascade", index=True)
+    system_id = fields.Many2one(related="external_id_id.system_id", store=True, index=True)
+    state = fields.Selection(
+        [("pending", "Pending"), ("done", "Done"), ("failed", "Failed")],
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempts = fields.Integer(default=0)
+    next_attempt_at = fields.Datetime(default=fields.Datetime.now, required=True)
+    date_started = fields.Datetime(string="Last Attempt")
+    date_done = fields.Datetime(string="Done On")
+    last_error = fields.Text()
+
+    def init(self) -> None:
+        super().init()
+        create_index(
+            self.env.cr,
+            "external_sync_job_due_idx",
+            self._table,
+            ["system_id", "next_attempt_at", "id"],
+            where="state = 'pending'",
+        )
+        # One row per batch started, counted by the per-system rate limit
+        self.env.cr.execute(
+            SQL(
+                """
+                CREATE TABLE IF NOT EXISTS %s (
+                    id bigserial PRIMARY KEY,
+                    system_id integer NOT NULL,
+                    started_at timestamp NOT NULL
+                )
+                """,
+                SQL.identifier(BATCH_START_TABLE),
+            )
+        )
+        create_index(
+            self.env.cr, "external_sync_batch_start_system_idx", BATCH_START_TABLE, ["system_id", "started_at"]
+        )
+
+    @api.model
+    def _enqueue(self, external_ids: "odoo.model.external_id") -> "odoo.model.external_sync_job":
+        # Skip IDs that already wait in the queue
+        queued = self.search_fetch(
+            [("external_id_id", "in", external_ids.ids), ("state", "=", "pending")], ["external_id_id"]
+        )
+        todo = external_ids - queued.external_id_id
+        return self.create([{"external_id_id": external_id.id} for external_id in todo])
+
+    @api.model
+    def _cron_process_jobs(self, time_budget: float = CRON_TIME_BUDGET) -> None:
+        deadline = time.monotonic() + time_budget
+        groups = self._read_group(
+            [("state", "=", "pending"), ("next_attempt_at", "<=", fields.Datetime.now())], ["system_id"]
+        )
+        pending = [system for system, in groups if system.active]
+        # Round-robin over systems so one busy marketplace cannot starve the others
+        while pending and time.monotonic() < deadline:
+            for system in list(pending):
+                if not self._process_system_batch(system):
+                    pending.remove(system)
+
+    @api.model
+    def _get_worker_crons(self) -> "odoo.model.ir_cron":
+        cron = self.env.ref(SYNC_CRON_XMLID, raise_if_not_found=False)
+        if not cron:
+            return self.env["ir.cron"]
+        workers = (
+            self.env["ir.cron"]
+            .sudo()
+            .with_context(active_test=False)
+            .search([("model_id", "=", cron.model_id.id), ("code", "=", cron.code), ("id", "!=", cron.id)], order="id")
+        )
+        return cron.sudo() | workers
+
+    @api.model
+    def _sync_worker_crons(self) -> None:
+        # Odoo never runs a cron record twice at once: one record per batch allowed to run in parallel
+        crons = self._get_worker_crons()
+        if not crons:
+            return
+        concurrency = self.env["external.system"].sudo().search([]).mapped("sync_max_concurrency")
+        wanted = max([*concurrency, 1])
+        crons[wanted:].unlink()
+        main = crons[0]
+        # Workers run as the main cron's user and with its priority
+        shared = {"user_id": main.user_id.id, "priority": main.priority}
+        stale = crons[1:wanted].filtered(
+            lambda worker: worker.user_id != main.user_id or worker.priority != main.priority
+        )
+        if stale:
+            stale.write(shared)
+        self.env["ir.cron"].sudo().create(
+            [
+                {
+                    "name": f"{main.name} (worker {index + 1})",
+                    "model_id": main.model_id.id,
+                    "state": "code",
+                    "code": main.code,
+                    "interval_number": main.interval_number,
+                    "interval_type": main.interval_type,
+                    "active": main.active,
+                    **shared,
+                }
+                for index in range(len(crons), wanted)
+            ]
+        )
+
+    @api.model
+    def _process_system_batch(self, system: "odoo.model.external_system") -> bool:
+        cr = self.env.cr
+        now = fields.Datetime.now()
+        # Concurrency cap: each running batch holds one of the system's slots until it commits
+        if not any(self._try_lock_slot(system, slot) for slot in range(max(system.sync_max_concurrency, 1))):
+            return False
+
+        self.flush_model()
+        cr.execute(
+            SQL(
+                """
+                SELECT id FROM external_sync_job
+                 WHERE system_id = %s AND state = 'pending' AND next_attempt_at <= %s
+              ORDER BY next_attempt_at, id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+                """,
+                system.id,
+                now,
+                max(system.sync_batch_size, 1),
+            )
+        )
+        jobs = self.browse([row[0] for row in cr.fetchall()])
+        if not jobs or not self._claim_batch_start(system):
+            return False
+
+        cr.execute(
+            SQL(
+                "UPDATE external_sync_job SET attempts = attempts + 1, date_started = %s WHERE id = ANY(%s)",
+                now,
+                jobs.ids,
+            )
+        )
+        jobs.invalidate_recordset(["attempts", "date_started"])
+        try:
+            with cr.savepoint():
+                failures = system._sync_dispatch(jobs.external_id_id) or {}
+        except Exception as error:  # adapter errors are retried, never fatal to the worker
+            _logger.warning("External sync batch for %s failed: %s", system.code, error)
+            failures = {job.external_id_id.id: str(error) for job in jobs}
+
+        failed = jobs.filtered(lambda job: job.external_id_id.id in failures)
+        succeeded = jobs - failed
+        succeeded.write({"state": "done", "date_done": now, "last_error": False})
+        succeeded.external_id_id.mark_synced(now)
+        for job in failed:
+            job.last_error = failures[job.external_id_id.id]
+            if job.attempts >= system.sync_max_attempts:
+                job.state = "failed"
+            else:
+                # Exponential backoff from the system's base retry delay
+                job.next_attempt_at = now + timedelta(seconds=system.sync_retry_delay * 2 ** (job.attempts - 1))
+
+        if not getattr(threading.current_thread(), "testing", False):
+            cr.commit()
+        return True
+
+    @api.model
+    def _claim_batch_start(self, system: "odoo.model.external_system") -> bool:
+        if not system.sync_rate_limit:
+            return True
+        if getattr(threading.current_thread(), "testing", False):
+            return self._insert_batch_start(self.env.cr, system)
+        # Committed at once, so the other workers count this start while the batch is still running
+        with self.env.registry.cursor() as cr:
+            return self._insert_batch_start(cr, system)
+
+    @api.model
+    def _insert_batch_start(self, cr: "odoo.sql_db.Cursor", system: "odoo.model.external_system") -> bool:
+        # The per-system lock makes the count and the insert atomic across workers
+        cr.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s))", f"external_sync_rate:{system.id}"))
+        cr.execute(
+            SQL(
+                """
+                INSERT INTO %(table)s (system_id, started_at)
+                SELECT %(system_id)s, clock_timestamp() AT TIME ZONE 'UTC'
+                 WHERE (
+                       SELECT COUNT(*) FROM %(table)s
+                        WHERE system_id = %(system_id)s
+                          AND started_at > clock_timestamp() AT TIME ZONE 'UTC' - %(window)s * interval '1 second'
+                       ) < %(limit)s
+             RETURNING id
+                """,
+                table=SQL.identifier(BATCH_START_TABLE),
+                system_id=system.id,
+                window=RATE_LIMIT_WINDOW,
+                limit=system.sync_rate_limit,
+            )
+        )
+        return bool(cr.fetchone())
+
+    @api.model
+    def _try_lock_slot(self, system: "odoo.model.external_system", slot: int) -> bool:
+        self.env.cr.execute(
+            SQL("SELECT pg_try_advisory_xact_lock(hashtext(%s), %s)", f"external_sync:{system.id}", slot)
+        )
+        return self.env.cr.fetchone()[0]
+
+    def action_retry(self) -> None:
+        self.write({"state": "pending", "attempts": 0, "next_attempt_at": fields.Datetime.now()})
+
+    @api.autovacuum
+    def _gc_done_jobs(self) -> None:
+        cutoff = fields.Datetime.now() - timedelta(days=DONE_JOB_RETENTION_DAYS)
+        self.search([("state", "=", "done"), ("date_done", "<", cutoff)]).unlink()
+        self.env.cr.execute(
+            SQL(
+                "DELETE FROM %s WHERE started_at < %s",
+                SQL.identifier(BATCH_START_TABLE),
+                fields.Datetime.now() - timedelta(seconds=RATE_LIMIT_WINDOW),
+            )
+        )
@@ -1,7 +1,35 @@
-from odoo import models, fields, api
+import functools
+import re
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 
 
+@functools.lru_cache(maxsize=256)
+def compile_id_format(system_id: int, write_date: datetime | None, id_format: str) -> re.Pattern:
+    # write_date only moves once per transaction, so the pattern itself is part of the key too
+    return re.compile(id_format)
+
+
+class SystemInfo(NamedTuple):
+    # Immutable snapshot of an external.system row, safe to share through ormcache
+    id: int
+    code: str
+    name: str
+    active: bool
+    url: str
+    id_format: str
+    id_prefix: str
+    id_pattern: re.Pattern | None
+
+    def get_invalid_external_ids(self, values: list[str]) -> list[str]:
+        if not self.id_pattern:
+            return []
+        return [value for value in values if not self.id_pattern.match(value)]
+
+
 class ExternalSystem(models.Model):
     _name = "external.system"
     _description = "External System Configuration"
@@ -28,22 +56,139 @@ class ExternalSystem(models.Model):
     external_ids = fields.One2many("external.id", "system_id", string="External IDs")
     url_templates = fields.One2many("external.system.url", "system_id", string="URL Templates")
     external_id_count = fields.Integer(string="Number of Records", compute="_compute_external_id_count")
+    sync_adapter = fields.Selection(
+        [("timestamp", "Timestamp Only")],
+        default="timestamp",
+        required=True,
+        help="How queued sync jobs are pushed to the system; modules add adapters with selection_add",
+    )
+    sync_batch_size = fields.Integer(default=100, help="External IDs sent to the adapter per batch")
+    sync_max_concurrency = fields.Integer(
+        default=1, help="Batches allowed to run in parallel for this system, each by its own sync queue cron worker"
+    )
+    sync_rate_limit = fields.Integer(help="Maximum batches started per minute (0 means unlimited)")
+    sync_max_attempts = fields.Integer(default=5, help="Attempts before a sync job is marked as failed")
+    sync_retry_delay = fields.Integer(
+        string="Retry Delay (s)", default=60, help="Base delay before a retry, doubled after every failed attempt"
+    )
 
     _sql_constraints = [
         ("code_unique", "UNIQUE(code)", "System code must be unique!"),
         ("name_unique", "UNIQUE(name)", "System name must be unique!"),
     ]
 
-    @api.depends("external_ids")
     def _compute_external_id_count(self) -> None:
+        counts = dict(
+            self.env["external.id"]._read_group([("system_id", "in", self._origin.ids)], ["system_id"], ["__count"])
+        )
         for system in self:
-            system.external_id_count = len(system.external_ids)
+            system.external_id_count = counts.get(system._origin, 0)
+
+    def get_external_id_breakdown(self, groupby: tuple[str, ...] = ("res_model",)) -> dict[int, dict[Any, int]]:
+        # Counts per system split by e.g. res_model and/or resource, from a single grouped query
+        breakdown: dict[int, dict[Any, int]] = {system_id: {} for system_id in self.ids}
+        rows = self.env["external.id"]._read_group(
+            [("system_id", "in", self.ids)], ["system_id", *groupby], ["__count"]
+        )
+        for system, *keys, count in rows:
+            breakdown[system.id][keys[0] if len(keys) == 1 else tuple(keys)] = count
+        return breakdown
+
+    @api.model_create_multi
+    def create(self, vals_list: "list[odoo.values.external_system]") -> "odoo.model.external_system":
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        self.env["external.sync.job"]._sync_worker_crons()
+        return records
+
+    def write(self, vals: "odoo.values.external_system") -> bool:
+        result = super().write(vals)
+        self.env.registry.clear_cache()
+        if {"code", "active"}.intersection(vals):
+            self.env["external.id"]._invalidate_lookup_cache()
+        if {"sync_max_concurrency", "active"}.intersection(vals):
+            self.env["external.sync.job"]._sync_worker_crons()
+        return result
+
+    def unlink(self) -> bool:
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        self.env["external.sync.job"]._sync_worker_crons()
+        self.env["external.id"]._invalidate_lookup_cache()
+        return result
+
+    @api.model
+    @tools.ormcache("code")
+    def _get_system_info(self, code: str) -> SystemInfo | None:
+        system = self.sudo().with_context(active_test=False).search([("code", "=", code)], limit=1)
+        return system._to_system_info() if system else None
+
+    @api.model
+    @tools.ormcache()
+    def _get_active_system_infos(self) -> tuple[SystemInfo, ...]:
+        return tuple(system._to_system_info() for system in self.sudo().search([]))
+
+    def _to_system_info(self) -> SystemInfo:
+        self.ensure_one()
+        return SystemInfo(
+            id=self.id,
+            code=self.code,
+            name=self.name,
+            active=self.active,
+            url=self.url or "",
+            id_format=self.id_format or "",
+            id_prefix=self.id_prefix or "",
+            id_pattern=self._get_id_pattern(),
+        )
+
+    @api.model
+    def _match_system_ids(self, text: str) -> list[int]:
+        # Exact code/name first; otherwise the substring match the old ilike join gave
+        needle = (text or "").strip().lower()
+        if not needle:
+            return []
+        systems = self._get_active_system_infos()
+        exact = [system.id for system in systems if needle in (system.code.lower(), system.name.lower())]
+        if exact:
+            return exact
+        return [system.id for system in systems if needle in system.code.lower() or needle in system.name.lower()]
+
+    def _get_id_pattern(self) -> re.Pattern | None:
+        self.ensure_one()
+        if not self.id_format:
+            return None
+        try:
+            return compile_id_format(self.id, self.write_date, self.id_format)
+        except re.error:
+            # Rows saved before the constraint existed: skip the format check rather than break lookups
+            return None
+
+    @api.model
+    def _resolve_system(self, code: str) -> SystemInfo | None:
+        # Archived systems are treated as unknown, like a plain search() would
+        info = self._get_system_info(code) if code else None
+        return info if info and info.active else None
+
+    def _sync_dispatch(self, external_ids: "odoo.model.external_id") -> dict[int, str]:
+        # Returns the failures of the batch as {external.id id: error message}
+        self.ensure_one()
+        return getattr(self, f"_sync_adapter_{self.sync_adapter}")(external_ids)
+
+    def _sync_adapter_timestamp(self, external_ids: "odoo.model.external_id") -> dict[int, str]:
+        return {}
+
+    @api.constrains("id_format")
+    def _check_id_format(self) -> None:
+        for system in self.filtered("id_format"):
+            try:
+                re.compile(system.id_format)
+            except re.error as error:
+                raise ValidationError(f"Invalid ID format for {system.name}: {error}") from error
 
     @api.ondelete(at_uninstall=False)
     def _unlink_prevent_when_has_ids(self) -> None:
-        for rec in self:
-            if rec.external_ids:
-                raise ValidationError(
-                    "Cannot delete an External System that still has External IDs. "
-                    "Archive the system or remove the related IDs first."
-                )
+        if self.env["external.id"].search_count([("system_id", "in", self.ids)], limit=1):
+            raise ValidationError(
+                "Cannot delete an External System that still has External IDs. "
+                "Archive the system or remove the related IDs first."
+            )
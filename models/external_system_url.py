@@ -1,4 +1,46 @@
-from odoo import models, fields, api
+import string
+from typing import NamedTuple
+
+from odoo import models, fields, api, tools
+
+# Tokens accepted in URL templates, with sample values used to validate them
+URL_TEMPLATE_TOKENS = {
+    "id": "123",
+    "gid": "gid://example/Model/123",
+    "model": "res.partner",
+    "name": "Record Name",
+    "code": "shopify",
+    "base": "https://example.com",
+}
+
+
+class UrlRenderer(NamedTuple):
+    # A URL template split once into (literal, token) pieces, shared through ormcache
+    template: str
+    resource: str | None
+    pieces: tuple[tuple[str, str | None], ...] | None
+    tokens: frozenset[str]
+
+    @classmethod
+    def parse(cls, template: str, resource: str | None = None) -> "UrlRenderer":
+        pieces = []
+        tokens = set()
+        simple = True
+        try:
+            for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+                if field_name is not None:
+                    tokens.add(field_name)
+                    simple = simple and field_name in URL_TEMPLATE_TOKENS and not format_spec and not conversion
+                pieces.append((literal, field_name))
+        except ValueError:
+            simple = False
+        # Anything beyond plain {token} placeholders falls back to str.format
+        return cls(template, resource, tuple(pieces) if simple else None, frozenset(tokens))
+
+    def render(self, values: dict[str, str]) -> str:
+        if self.pieces is None:
+            return self.template.format(**values)
+        return "".join(literal + (values[token] if token is not None else "") for literal, token in self.pieces)
 
 
 class ExternalSystemUrl(models.Model):
@@ -46,6 +88,36 @@ class ExternalSystemUrl(models.Model):
         v = re.sub(r"[\s-]+", "_", v).strip("_")
         return v
 
+    @api.model_create_multi
+    def create(self, vals_list: "list[odoo.values.external_system_url]") -> "odoo.model.external_system_url":
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return records
+
+    def unlink(self) -> bool:
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
+
+    @api.model
+    @tools.ormcache("system_id", "code", "model_name")
+    def _get_url_renderer(self, system_id: int, code: str, model_name: str) -> UrlRenderer | None:
+        urls = self.sudo().search(
+            [
+                ("system_id", "=", system_id),
+                ("code", "=", code),
+                ("active", "=", True),
+                "|",
+                ("res_model_id", "=", False),
+                ("res_model_id.model", "=", model_name),
+            ],
+            order="res_model_id desc, sequence, id",
+            limit=1,
+        )
+        if not urls:
+            return None
+        return UrlRenderer.parse(urls.template, urls.resource or None)
+
     @api.onchange("name")
     def _onchange_name_autofill_code(self) -> None:
         for rec in self:
@@ -57,7 +129,10 @@ class ExternalSystemUrl(models.Model):
             # Disallow changing code outside of the rename wizard
             vals = dict(vals)
             vals.pop("code", None)
-        return super().write(vals)
+        result = super().write(vals)
+        # Covers template edits, archiving and the rename wizard
+        self.env.registry.clear_cache()
+        return result
 
     def action_open_rename_wizard(self) -> dict:
         self.ensure_one()
@@ -75,16 +150,10 @@ class ExternalSystemUrl(models.Model):
 
     @api.constrains("template")
     def _check_template_tokens(self) -> None:
-        allowed = {
-            "id": "123",
-            "gid": "gid://example/Model/123",
-            "model": "res.partner",
-            "name": "Record Name",
-            "code": "shopify",
-            "base": "https://example.com",
-        }
         for rec in self:
             try:
-                (rec.template or "").format(**allowed)
+                (rec.template or "").format(**URL_TEMPLATE_TOKENS)
             except KeyError as e:  # unknown token
-                raise ValueError(f"Unknown token {e} in URL template. Allowed: {', '.join(sorted(allowed))}.")
+                raise ValueError(
+                    f"Unknown token {e} in URL template. Allowed: {', '.join(sorted(URL_TEMPLATE_TOKENS))}."
+                )
@@ -0,0 +1,15 @@
+from odoo import models
+
+from .external_sync_job import SYNC_CRON_XMLID
+
+
+class IrCron(models.Model):
+    _inherit = "ir.cron"
+
+    def write(self, vals: "odoo.values.ir_cron") -> bool:
+        result = super().write(vals)
+        if {"user_id", "priority"}.intersection(vals):
+            main = self.env.ref(SYNC_CRON_XMLID, raise_if_not_found=False)
+            if main and main in self:
+                self.env["external.sync.job"]._sync_worker_crons()
+        return result
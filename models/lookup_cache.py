@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Iterable
+from typing import Any
+
+DEFAULT_LOOKUP_CACHE_SIZE = 10000
+DEFAULT_LOOKUP_CACHE_TTL = 300
+# A worker that has not replayed the invalidation log for this long clears its cache instead;
+# the log itself is pruned past twice this age.
+LOOKUP_CACHE_REPLAY_WINDOW = 1800
+
+
+# Thread-safe LRU with a TTL and hit/miss counters, shared by the threads of a worker.
+# ``position`` is the last row of the invalidation log applied to the entries: a value read
+# under an older database snapshot is not stored, as a newer change may already have been applied.
+class LookupCache:
+    def __init__(self, max_size: int = DEFAULT_LOOKUP_CACHE_SIZE, ttl: float = DEFAULT_LOOKUP_CACHE_TTL) -> None:
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.position: int | None = None
+        self.replayed_at = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, max_size: int, ttl: float) -> None:
+        with self._lock:
+            self.max_size = max(max_size, 0)
+            self.ttl = ttl
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def needs_reset(self) -> bool:
+        return self.position is None or time.monotonic() - self.replayed_at > LOOKUP_CACHE_REPLAY_WINDOW
+
+    def reset(self, position: int) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.position = position
+            self.replayed_at = time.monotonic()
+
+    def apply(self, position: int, keys: Iterable[Hashable], clear: bool = False) -> None:
+        with self._lock:
+            if self.position is not None and position <= self.position:
+                return
+            if clear:
+                self._entries.clear()
+            else:
+                for key in keys:
+                    self._entries.pop(key, None)
+            self.position = position
+            self.replayed_at = time.monotonic()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (self.ttl and entry[0] < time.monotonic()):
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, position: int | None = None) -> None:
+        if not self.max_size:
+            return
+        with self._lock:
+            if position is not None and self.position is not None and position < self.position:
+                return
+            expiry = time.monotonic() + self.ttl if self.ttl else 0.0
+            self._entries[key] = (expiry, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, keys: Iterable[Hashable]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "position": self.position,
+            }
+
+
+_caches: dict[str, LookupCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_lookup_cache(dbname: str) -> LookupCache:
+    with _caches_lock:
+        if dbname not in _caches:
+            _caches[dbname] = LookupCache()
+        return _caches[dbname]
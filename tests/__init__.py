@@ -1 +1,2 @@
 from . import unit
+from . import benchmarks
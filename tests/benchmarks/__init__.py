@@ -0,0 +1,2 @@
+from . import test_external_id_benchmarks
+from . import test_index_benchmarks
@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from odoo import fields, release
+
+from ..common_imports import tagged, BENCHMARK_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import BulkRecordFactory, ExternalSystemFactory
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = "10000,100000,1000000"
+DEFAULT_ITERATIONS = 50
+HOST_MODELS = ("res.partner", "product.template", "hr.employee")
+LIST_PAGE_SIZE = 80
+
+
+@tagged(*BENCHMARK_TAGS)
+class BenchmarkExternalIds(UnitTestCase):
+    # Scales, iterations and the report path come from EXTERNAL_IDS_BENCHMARK_SCALES,
+    # EXTERNAL_IDS_BENCHMARK_ITERATIONS and EXTERNAL_IDS_BENCHMARK_REPORT.
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.scales = sorted(
+            int(scale) for scale in os.environ.get("EXTERNAL_IDS_BENCHMARK_SCALES", DEFAULT_SCALES).split(",")
+        )
+        self.iterations = int(os.environ.get("EXTERNAL_IDS_BENCHMARK_ITERATIONS", DEFAULT_ITERATIONS))
+        self.report_path = os.environ.get(
+            "EXTERNAL_IDS_BENCHMARK_REPORT", os.path.join(tempfile.gettempdir(), "external_ids_benchmark.json")
+        )
+        self.random = random.Random(0)
+        self.system = ExternalSystemFactory.create(
+            self.env, name="Benchmark", code="benchmark", id_format=False, url="https://bench.example.com"
+        )
+        self.env["external.system.url"].create(
+            {"name": "Store", "code": "store", "system_id": self.system.id, "template": "{base}/items/{id}"}
+        )
+        self.templates = {
+            "res.partner": self.Partner.create({"name": "Benchmark Partner"}),
+            "product.template": self.env["product.template"].create({"name": "Benchmark Product"}),
+            "hr.employee": self.Employee.create({"name": "Benchmark Employee"}),
+        }
+        # (res_model, res_ids, prefix) per seeded batch; the external ID of res_ids[n] is f"{prefix}{n + 1}"
+        self.batches: list[tuple[str, list[int], str]] = []
+        self.seeded = 0
+
+    def _seed(self, scale: int) -> None:
+        missing = scale - self.seeded
+        for index, res_model in enumerate(HOST_MODELS):
+            count = missing // len(HOST_MODELS) + (missing % len(HOST_MODELS) if index == 0 else 0)
+            res_ids = BulkRecordFactory.clone(self.env, self.templates[res_model], count)
+            prefix = f"{res_model.split('.')[0][0].upper()}{scale}-"
+            BulkRecordFactory.create_external_ids(self.env, self.system, res_model, res_ids, prefix)
+            self.batches.append((res_model, res_ids, prefix))
+        self.seeded = scale
+        self.env.cr.execute("ANALYZE external_id")
+        self.env.invalidate_all()
+
+    def _sample_hosts(self) -> list[tuple[str, int, str]]:
+        weights = [len(res_ids) for _res_model, res_ids, _prefix in self.batches]
+        samples = []
+        for res_model, res_ids, prefix in self.random.choices(self.batches, weights, k=self.iterations + 1):
+            position = self.random.randrange(len(res_ids))
+            samples.append((res_model, res_ids[position], f"{prefix}{position + 1}"))
+        return samples
+
+    def _measure(self, operation: Callable[[int], Any]) -> dict[str, Any]:
+        timings = []
+        queries = 0
+        for index in range(self.iterations):
+            self.env.invalidate_all()
+            query_count = self.env.cr.sql_log_count
+            start = time.perf_counter()
+            operation(index)
+            self.env.flush_all()
+            timings.append(time.perf_counter() - start)
+            queries += self.env.cr.sql_log_count - query_count
+        # One extra traced call: tracemalloc slows everything down too much to time under it
+        self.env.invalidate_all()
+        tracemalloc.start()
+        operation(self.iterations)
+        self.env.flush_all()
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        timings.sort()
+        return {
+            "calls": len(timings),
+            "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+            "p50_ms": round(timings[len(timings) // 2] * 1000, 3),
+            "p95_ms": round(timings[min(int(len(timings) * 0.95), len(timings) - 1)] * 1000, 3),
+            "max_ms": round(timings[-1] * 1000, 3),
+            "queries_per_call": round(queries / len(timings), 2),
+            "peak_memory_kib": round(peak / 1024, 1),
+        }
+
+    def _run_scale(self, scale: int) -> dict[str, Any]:
+        ExternalId = self.env["external.id"]
+        samples = self._sample_hosts()
+        set_hosts = self.Partner.browse(BulkRecordFactory.clone(self.env, self.templates["res.partner"], len(samples)))
+        list_offsets = [self.random.randrange(max(scale - LIST_PAGE_SIZE, 1)) for _sample in samples]
+
+        def set_external_id(index: int) -> None:
+            set_hosts[index].set_external_id("benchmark", f"SET{scale}-{index}")
+
+        def search_by_external_id(index: int) -> None:
+            res_model, _res_id, value = samples[index]
+            self.env[res_model].search_by_external_id("benchmark", value)
+
+        def get_record_by_external_id(index: int) -> None:
+            ExternalId._get_lookup_cache()[0].clear()
+            ExternalId.get_record_by_external_id("benchmark", samples[index][2])
+
+        def get_record_by_external_id_cached(index: int) -> None:
+            ExternalId.get_record_by_external_id("benchmark", samples[index][2])
+
+        def get_external_url(index: int) -> None:
+            res_model, res_id, _value = samples[index]
+            self.env[res_model].browse(res_id).get_external_url("benchmark")
+
+        def list_record_names(index: int) -> None:
+            page = ExternalId.search(
+                [("system_id", "=", self.system.id)], offset=list_offsets[index], limit=LIST_PAGE_SIZE, order="id"
+            )
+            page.mapped("record_name")
+
+        # Warm the lookup cache so the cached variant, measured first, only sees hits
+        for index in range(len(samples)):
+            get_record_by_external_id_cached(index)
+        return {
+            "rows": ExternalId.search_count([]),
+            "operations": {
+                operation.__name__: self._measure(operation)
+                for operation in (
+                    get_record_by_external_id_cached,
+                    search_by_external_id,
+                    get_record_by_external_id,
+                    get_external_url,
+                    list_record_names,
+                    set_external_id,
+                )
+            },
+        }
+
+    def test_benchmark_report(self) -> None:
+        report: dict[str, Any] = {
+            "generated_at": fields.Datetime.to_string(fields.Datetime.now()),
+            "odoo_version": release.version,
+            "iterations": self.iterations,
+            "scales": {},
+        }
+        for scale in self.scales:
+            seed_start = time.perf_counter()
+            self._seed(scale)
+            _logger.info("Seeded %s external IDs in %.1fs", scale, time.perf_counter() - seed_start)
+            report["scales"][str(scale)] = self._run_scale(scale)
+
+        with open(self.report_path, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2, sort_keys=True)
+        _logger.info("External ID benchmark report written to %s", self.report_path)
+        for results in report["scales"].values():
+            self.assertTrue(all(result["calls"] == self.iterations for result in results["operations"].values()))
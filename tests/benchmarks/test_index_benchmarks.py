@@ -0,0 +1,10 @@
+from ..common_imports import tagged, BENCHMARK_TAGS
+from ..fixtures.base import UnitTestCase
+from ..unit.test_indexes import ExternalIdIndexChecks
+
+
+@tagged(*BENCHMARK_TAGS)
+class BenchmarkExternalIdIndexes(ExternalIdIndexChecks, UnitTestCase):
+    # At production size the planner must pick the indexes on its own
+    ROW_COUNT = 1_000_000
+    FORCE_INDEX_SCAN = False
@@ -1,8 +1,17 @@
 from typing import Any
 from odoo.tests import tagged
-from odoo.exceptions import ValidationError
+from odoo.exceptions import AccessError, ValidationError
 
-__all__ = ["Any", "tagged", "ValidationError", "DEFAULT_TEST_CONTEXT", "STANDARD_TAGS", "UNIT_TAGS"]
+__all__ = [
+    "Any",
+    "tagged",
+    "AccessError",
+    "ValidationError",
+    "DEFAULT_TEST_CONTEXT",
+    "STANDARD_TAGS",
+    "UNIT_TAGS",
+    "BENCHMARK_TAGS",
+]
 
 DEFAULT_TEST_CONTEXT = {
     "tracking_disable": True,
@@ -14,3 +23,5 @@ DEFAULT_TEST_CONTEXT = {
 
 STANDARD_TAGS = ["post_install", "-at_install"]
 UNIT_TAGS = STANDARD_TAGS + ["unit_test", "external_ids"]
+# Opt-in only: run with --test-tags benchmark/external_ids
+BENCHMARK_TAGS = STANDARD_TAGS + ["-standard", "-unit_test", "benchmark", "external_ids"]
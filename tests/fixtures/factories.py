@@ -1,5 +1,6 @@
 from typing import Any
 from odoo.api import Environment
+from odoo.tools import SQL
 
 
 class ExternalSystemFactory:
@@ -28,3 +29,49 @@ class ExternalIdFactory:
         }
         defaults.update(kwargs)
         return env["external.id"].create(defaults)
+
+
+class BulkRecordFactory:
+    @staticmethod
+    def clone(env: Environment, record: Any, count: int) -> list[int]:
+        # Copies an ORM-created row in SQL; fast enough to seed hundreds of thousands of hosts
+        record.flush_recordset()
+        env.cr.execute(
+            SQL(
+                "SELECT column_name FROM information_schema.columns WHERE table_name = %s AND column_name <> 'id'",
+                record._table,
+            )
+        )
+        columns = SQL(", ").join(SQL.identifier(row[0]) for row in env.cr.fetchall())
+        env.cr.execute(
+            SQL(
+                "INSERT INTO %(table)s (%(columns)s) SELECT %(columns)s FROM %(table)s, generate_series(1, %(count)s) "
+                "WHERE %(table)s.id = %(id)s RETURNING id",
+                table=SQL.identifier(record._table),
+                columns=columns,
+                count=count,
+                id=record.id,
+            )
+        )
+        return sorted(row[0] for row in env.cr.fetchall())
+
+    @staticmethod
+    def create_external_ids(
+        env: Environment, system: Any, res_model: str, res_ids: list[int], prefix: str, resource: str = "default"
+    ) -> None:
+        env["external.id"].flush_model()
+        env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id (res_model, res_id, system_id, resource, external_id, active)
+                SELECT %(res_model)s, res_id, %(system_id)s, %(resource)s, %(prefix)s || position, TRUE
+                  FROM unnest(%(res_ids)s::int[]) WITH ORDINALITY AS hosts(res_id, position)
+                """,
+                res_model=res_model,
+                system_id=system.id,
+                resource=resource,
+                prefix=prefix,
+                res_ids=res_ids,
+            )
+        )
+        env["external.id"].invalidate_model()
@@ -1,3 +1,13 @@
 from . import test_external_system
 from . import test_external_id
 from . import test_external_id_mixin
+from . import test_indexes
+from . import test_external_id_import
+from . import test_external_id_export
+from . import test_external_system_url
+from . import test_external_id_change
+from . import test_external_sync_job
+from . import test_external_id_stats
+from . import test_external_id_promotion
+from . import test_external_id_purge
+from . import test_external_id_orphans
@@ -1,3 +1,8 @@
+from unittest.mock import patch
+
+from odoo import fields
+from odoo.addons.external_ids.models.lookup_cache import LookupCache
+
 from ..common_imports import tagged, ValidationError, UNIT_TAGS
 from ..fixtures.base import UnitTestCase
 from ..fixtures.factories import ExternalSystemFactory, ExternalIdFactory
@@ -89,6 +94,32 @@ class TestExternalId(UnitTestCase):
         external_id._compute_record_name()
         self.assertEqual(external_id.record_name, "[Deleted res.partner]")
 
+    def test_compute_record_name_batches_per_model(self) -> None:
+        partners = self.Partner.create([{"name": f"Batched Partner {index}"} for index in range(10)])
+        external_ids = self.ExternalId.create(
+            [
+                {
+                    "res_model": "res.partner",
+                    "res_id": partner.id,
+                    "system_id": self.discord_system.id,
+                    "external_id": f"{500000000000000000 + index}",
+                }
+                for index, partner in enumerate(partners)
+            ]
+        )
+        external_ids[-1].res_model = "not.a.model"
+
+        def count_queries(records: "odoo.model.external_id") -> int:
+            self.env.invalidate_all()
+            start = self.env.cr.sql_log_count
+            records.mapped("record_name")
+            records.mapped("company_id")
+            return self.env.cr.sql_log_count - start
+
+        self.assertEqual(count_queries(external_ids[:2]), count_queries(external_ids[:9]))
+        self.assertEqual(external_ids[0].record_name, "Batched Partner 0")
+        self.assertEqual(external_ids[-1].record_name, "[Invalid not.a.model]")
+
     def test_id_format_validation(self) -> None:
         partner = self.Partner.create({"name": "Validation Test"})
 
@@ -101,6 +132,51 @@ class TestExternalId(UnitTestCase):
                 external_id="invalid-format",
             )
 
+    def test_id_format_validation_reports_whole_batch(self) -> None:
+        partners = self.Partner.create([{"name": f"Batch Validation {index}"} for index in range(3)])
+
+        with self.assertRaises(ValidationError) as context:
+            self.ExternalId.create(
+                [
+                    {
+                        "res_model": "res.partner",
+                        "res_id": partners[0].id,
+                        "system_id": self.discord_system.id,
+                        "external_id": "123456789012345678",
+                    },
+                    {
+                        "res_model": "res.partner",
+                        "res_id": partners[1].id,
+                        "system_id": self.discord_system.id,
+                        "external_id": "bad-one",
+                    },
+                    {
+                        "res_model": "res.partner",
+                        "res_id": partners[2].id,
+                        "system_id": self.discord_system.id,
+                        "external_id": "bad-two",
+                    },
+                ]
+            )
+        self.assertIn("bad-one", str(context.exception))
+        self.assertIn("bad-two", str(context.exception))
+
+    def test_id_format_change_is_picked_up(self) -> None:
+        partner = self.Partner.create({"name": "Format Change"})
+        external_id = ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=partner.id,
+            system_id=self.discord_system.id,
+            external_id="123456789012345678",
+        )
+
+        self.discord_system.id_format = r"^[a-z]+$"
+        with self.assertRaises(ValidationError):
+            external_id.external_id = "123456789012345679"
+        external_id.external_id = "abc"
+        self.assertEqual(external_id.external_id, "abc")
+
     def test_unique_external_id_per_system(self) -> None:
         partner1 = self.Partner.create({"name": "Partner 1"})
         partner2 = self.Partner.create({"name": "Partner 2"})
@@ -161,6 +237,168 @@ class TestExternalId(UnitTestCase):
         not_found_system = self.ExternalId.get_record_by_external_id("invalid_system", "123")
         self.assertIsNone(not_found_system)
 
+    def test_get_records_by_external_ids(self) -> None:
+        partner = self.Partner.create({"name": "Batch Lookup Partner"})
+        employee = self.Employee.create({"name": "Batch Lookup Employee"})
+        ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=partner.id,
+            system_id=self.discord_system.id,
+            external_id="121212121212121212",
+        )
+        ExternalIdFactory.create(
+            self.env,
+            res_model="hr.employee",
+            res_id=employee.id,
+            system_id=self.discord_system.id,
+            external_id="131313131313131313",
+        )
+        deleted = self.Partner.create({"name": "Deleted Partner"})
+        ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=deleted.id,
+            system_id=self.discord_system.id,
+            external_id="141414141414141414",
+        )
+        deleted.unlink()
+
+        result = self.ExternalId.get_records_by_external_ids(
+            "discord", ["121212121212121212", "131313131313131313", "141414141414141414"]
+        )
+
+        self.assertEqual(result["records"]["121212121212121212"], partner)
+        self.assertEqual(result["records"]["131313131313131313"], employee)
+        self.assertEqual(result["missing"], ["141414141414141414"])
+        self.assertEqual(result["archived"], [])
+
+    def _commit_lookup_cache(self) -> None:
+        # Stands in for a commit: mappings written so far count as committed, and the next
+        # lookup replays the invalidation log as a new transaction would
+        self.env.cr.postcommit.clear()
+
+    def _lookup_delta(self, before: dict) -> tuple[int, int]:
+        after = self.ExternalId.get_lookup_cache_stats()
+        return after["hits"] - before["hits"], after["misses"] - before["misses"]
+
+    def test_get_record_by_external_id_cache(self) -> None:
+        partner = self.Partner.create({"name": "Cached Lookup"})
+        other = self.Partner.create({"name": "Other Lookup"})
+        external_id = ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=partner.id,
+            system_id=self.discord_system.id,
+            external_id="616161616161616161",
+        )
+
+        # Not cached while the transaction that wrote the mapping is running
+        stats = self.ExternalId.get_lookup_cache_stats()
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"), partner)
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"), partner)
+        self.assertEqual(self._lookup_delta(stats), (0, 0))
+
+        self._commit_lookup_cache()
+        stats = self.ExternalId.get_lookup_cache_stats()
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"), partner)
+        with self.assertQueryCount(0):
+            self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"), partner)
+        self.assertEqual(
+            self.ExternalId.get_record_by_external_id("discord", "616161616161616161", resource="default"), partner
+        )
+        self.assertEqual(self._lookup_delta(stats), (1, 2))
+
+        external_id.res_id = other.id
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"), other)
+        self.assertEqual(
+            self.ExternalId.get_record_by_external_id("discord", "616161616161616161", resource="default"), other
+        )
+
+        external_id.active = False
+        self.assertIsNone(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"))
+
+        external_id.unlink()
+        self.assertIsNone(self.ExternalId.get_record_by_external_id("discord", "616161616161616161"))
+
+    def test_lookup_cache_replays_changed_keys_only(self) -> None:
+        partners = self.Partner.create([{"name": "Replay A"}, {"name": "Replay B"}])
+        for index, partner in enumerate(partners):
+            ExternalIdFactory.create(
+                self.env,
+                res_model="res.partner",
+                res_id=partner.id,
+                system_id=self.discord_system.id,
+                external_id=f"81818181818181818{index}",
+            )
+        self._commit_lookup_cache()
+        self.ExternalId.get_record_by_external_id("discord", "818181818181818180")
+        self.ExternalId.get_record_by_external_id("discord", "818181818181818181")
+
+        # Another worker committed a change to the first mapping. The row is rolled back with the
+        # test, so the worker's log position is reset afterwards.
+        cache, _position = self.ExternalId._get_lookup_cache()
+        self.addCleanup(cache.reset, 0)
+        self.env.cr.execute(
+            "INSERT INTO external_id_lookup_invalidation (system_code, resource, external_id) "
+            "VALUES ('discord', NULL, '818181818181818180')"
+        )
+        self._commit_lookup_cache()
+        stats = self.ExternalId.get_lookup_cache_stats()
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "818181818181818180"), partners[0])
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "818181818181818181"), partners[1])
+        self.assertEqual(self._lookup_delta(stats), (1, 1))
+
+    def test_lookup_cache_drops_unlinked_hosts(self) -> None:
+        partner = self.Partner.create({"name": "Deleted Host"})
+        partner.set_external_id("discord", "828282828282828282")
+        self._commit_lookup_cache()
+        self.assertEqual(self.ExternalId.get_record_by_external_id("discord", "828282828282828282"), partner)
+
+        partner.unlink()
+        self.assertIsNone(self.ExternalId.get_record_by_external_id("discord", "828282828282828282"))
+
+    def test_lookup_cache_pending_keys_are_bounded(self) -> None:
+        partners = self.Partner.create([{"name": f"Bounded {index}"} for index in range(3)])
+        with patch("odoo.addons.external_ids.models.external_id.LOOKUP_INVALIDATION_MAX_KEYS", 4):
+            self.Partner.set_external_ids("discord", {partners[0].id: "848484848484848480"})
+            pending = self.env.cr.postcommit.data["external_ids.lookup_cache"]
+            self.assertEqual((len(pending["keys"]), pending["clear"]), (2, False))
+
+            self.Partner.set_external_ids(
+                "discord", {partner.id: f"84848484848484848{index + 1}" for index, partner in enumerate(partners)}
+            )
+            self.assertEqual((pending["keys"], pending["clear"]), (set(), True))
+            self.assertIsNone(self.ExternalId.get_record_by_external_id("discord", "848484848484848480"))
+
+    def test_lookup_cache_skips_stale_snapshots(self) -> None:
+        cache = LookupCache()
+        key = ("discord", None, "838383838383838383")
+        cache.reset(5)
+        cache.apply(7, [key])
+        # Read under a snapshot older than the last applied change
+        cache.set(key, ("res.partner", 1), position=6)
+        self.assertIsNone(cache.get(key))
+        cache.set(key, ("res.partner", 1), position=7)
+        self.assertEqual(cache.get(key), ("res.partner", 1))
+
+    def test_get_record_by_external_id_cache_size(self) -> None:
+        self.env["ir.config_parameter"].sudo().set_param("external_ids.lookup_cache_size", "1")
+        partners = self.Partner.create([{"name": "Size A"}, {"name": "Size B"}])
+        for index, partner in enumerate(partners):
+            ExternalIdFactory.create(
+                self.env,
+                res_model="res.partner",
+                res_id=partner.id,
+                system_id=self.discord_system.id,
+                external_id=f"71717171717171717{index}",
+            )
+        self._commit_lookup_cache()
+
+        self.ExternalId.get_record_by_external_id("discord", "717171717171717170")
+        self.ExternalId.get_record_by_external_id("discord", "717171717171717171")
+        self.assertEqual(self.ExternalId.get_lookup_cache_stats()["size"], 1)
+
     def test_action_sync(self) -> None:
         partner = self.Partner.create({"name": "Sync Test"})
         external_id = ExternalIdFactory.create(
@@ -176,8 +414,40 @@ class TestExternalId(UnitTestCase):
 
         self.assertEqual(result["type"], "ir.actions.client")
         self.assertEqual(result["tag"], "display_notification")
+        self.assertFalse(external_id.last_sync)
+        self.env["external.sync.job"]._cron_process_jobs()
         self.assertTrue(external_id.last_sync)
 
+    def test_name_search_routes_system_prefix(self) -> None:
+        partners = self.Partner.create([{"name": "Search A"}, {"name": "Search B"}])
+        discord_id = ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=partners[0].id,
+            system_id=self.discord_system.id,
+            external_id="123123123123123123",
+        )
+        shopify_id = ExternalIdFactory.create(
+            self.env,
+            res_model="res.partner",
+            res_id=partners[1].id,
+            system_id=self.shopify_system.id,
+            external_id="123123123123123123",
+        )
+
+        def found(name: str) -> set[int]:
+            return {record_id for record_id, _name in self.ExternalId.name_search(name)}
+
+        self.assertEqual(found("123123"), {discord_id.id, shopify_id.id})
+        self.assertEqual(found("discord:123123"), {discord_id.id})
+        self.assertEqual(found("Shop: 123123"), {shopify_id.id})
+        self.assertFalse(found("discord:999"))
+        self.assertFalse(found("unknown:123123"))
+
+        self.env["external.system"]._match_system_ids("discord")
+        with self.assertQueryCount(0):
+            self.assertEqual(self.env["external.system"]._match_system_ids("DISCORD"), [self.discord_system.id])
+
     def test_unlink_except_active(self) -> None:
         partner = self.Partner.create({"name": "Delete Test"})
         external_id = ExternalIdFactory.create(
@@ -201,3 +471,46 @@ class TestExternalId(UnitTestCase):
         self.assertIn("hr.employee", model_names)
         self.assertIn("res.partner", model_names)
         self.assertIn("product.product", model_names)
+
+    def test_mixin_models_from_inherit_chain(self) -> None:
+        model_names = self.ExternalId._mixin_models()
+
+        self.assertIn("res.partner", model_names)
+        self.assertIn("hr.employee", model_names)
+        self.assertIn("product.template", model_names)
+        self.assertNotIn("external.id.mixin", model_names)
+        self.assertIs(self.ExternalId._mixin_models(), model_names)
+
+        restricted = self.ExternalId.with_context(default_res_model="res.partner")._reference_models()
+        self.assertEqual([name for name, _label in restricted], ["res.partner"])
+
+    def test_mark_synced_and_stale_pages(self) -> None:
+        partners = self.Partner.create([{"name": f"Stale Partner {index}"} for index in range(5)])
+        external_ids = self.ExternalId.create(
+            [
+                {
+                    "res_model": "res.partner",
+                    "res_id": partner.id,
+                    "system_id": self.discord_system.id,
+                    "external_id": f"{800000000000000000 + index}",
+                }
+                for index, partner in enumerate(partners)
+            ]
+        )
+        self.assertEqual(external_ids[:2].mark_synced(fields.Datetime.to_datetime("2026-01-01 00:00:00")), 2)
+        self.assertEqual(external_ids[2].mark_synced(fields.Datetime.to_datetime("2026-06-01 00:00:00")), 1)
+        self.assertEqual(external_ids[0].last_sync, fields.Datetime.to_datetime("2026-01-01 00:00:00"))
+
+        stale_before = fields.Datetime.to_datetime("2026-03-01 00:00:00")
+        seen = self.ExternalId
+        page, cursor = self.ExternalId.get_stale_external_ids(stale_before, "discord", "res.partner", limit=2)
+        while True:
+            seen |= page
+            if not cursor:
+                break
+            page, cursor = self.ExternalId.get_stale_external_ids(
+                stale_before, "discord", "res.partner", limit=2, cursor=cursor
+            )
+
+        self.assertEqual(seen, external_ids[0] | external_ids[1] | external_ids[3] | external_ids[4])
+        self.assertEqual(seen[:2], external_ids[3:5])
@@ -0,0 +1,97 @@
+from odoo import sql_db
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdChange(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.Change = self.env["external.id.change"]
+        self.system = ExternalSystemFactory.create(self.env, name="Feed", code="feed")
+        self.partners = self.Partner.create([{"name": "Feed A"}, {"name": "Feed B"}])
+
+    def _commit_changes(self) -> None:
+        # Changes only enter the feed once their transaction is older than every running one
+        self.env.flush_all()
+        self.env.cr.execute(SQL("UPDATE external_id_change SET txid = 1 WHERE seq IS NULL"))
+
+    def _changes(self) -> "odoo.model.external_id_change":
+        return self.Change.search([("system_id", "=", self.system.id)], order="id")
+
+    def test_mutations_are_logged(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        self.partners[0].set_external_id("feed", "A2")
+        external_id = self.ExternalId.search([("system_id", "=", self.system.id)])
+        external_id.last_sync = "2026-01-01 00:00:00"
+        external_id.active = False
+        external_id.unlink()
+
+        changes = self._changes()
+        self.assertEqual(changes.mapped("operation"), ["create", "write", "write", "unlink"])
+        self.assertEqual(changes.mapped("external_id"), ["A1", "A2", "A2", "A2"])
+        self.assertEqual(changes[-1].external_record_id, external_id.id)
+        self.assertEqual(set(changes.mapped("system_code")), {"feed"})
+
+    def test_refused_unlink_is_not_logged(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        external_id = self.ExternalId.search([("system_id", "=", self.system.id)])
+
+        with self.assertRaises(ValidationError):
+            external_id.unlink()
+        self.assertEqual(self._changes().mapped("operation"), ["create"])
+
+    def test_bulk_upsert_is_logged(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        self.Partner.set_external_ids("feed", {self.partners[0].id: "A9", self.partners[1].id: "B1"})
+
+        self.assertEqual(self._changes().mapped("operation"), ["create", "create", "write"])
+        self.assertEqual(self._changes().mapped("external_id"), ["A1", "B1", "A9"])
+
+    def test_changes_since_cursor(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        self.partners[1].set_external_id("feed", "B1")
+        self.assertEqual(self.Change.changes_since(0)["changes"], [])
+
+        self._commit_changes()
+        first = self.Change.changes_since(0, limit=1)
+        self.assertEqual([change["external_id"] for change in first["changes"]], ["A1"])
+        second = self.Change.changes_since(first["seq"])
+        self.assertEqual([change["external_id"] for change in second["changes"]], ["B1"])
+        self.assertGreater(second["seq"], first["seq"])
+        self.assertEqual(self.Change.changes_since(second["seq"]), {"changes": [], "seq": second["seq"]})
+
+        self.partners[1].set_external_id("feed", "B2")
+        self._commit_changes()
+        third = self.Change.changes_since(second["seq"])
+        self.assertEqual([change["operation"] for change in third["changes"]], ["write"])
+
+    def test_changes_since_does_not_wait_for_numbering(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        self._commit_changes()
+        # Another consumer is numbering the feed: the reader skips instead of waiting on the lock
+        with sql_db.db_connect(self.env.cr.dbname).cursor() as other_cr:
+            other_cr.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s))", "external_id_change_seq_counter"))
+            self.assertEqual(self.Change.changes_since(0)["changes"], [])
+        self.assertEqual([change["external_id"] for change in self.Change.changes_since(0)["changes"]], ["A1"])
+
+    def test_retention_and_compaction(self) -> None:
+        self.partners[0].set_external_id("feed", "A1")
+        self.partners[0].set_external_id("feed", "A2")
+        self.partners[1].set_external_id("feed", "B1")
+        self._commit_changes()
+        self.env.cr.execute(SQL("UPDATE external_id_change SET create_date = now() - interval '10 days'"))
+        params = self.env["ir.config_parameter"].sudo()
+        params.set_param("external_ids.change_compact_days", "5")
+        params.set_param("external_ids.change_retention_days", "0")
+
+        self.Change._gc_changes()
+        self.assertEqual(self._changes().mapped("external_id"), ["A2", "B1"])
+
+        params.set_param("external_ids.change_retention_days", "7")
+        self.Change._gc_changes()
+        self.assertFalse(self._changes())
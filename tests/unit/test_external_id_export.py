@@ -0,0 +1,55 @@
+import csv
+import io
+import json
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdExport(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.warehouse = ExternalSystemFactory.create(self.env, name="Warehouse", code="warehouse")
+        self.other = ExternalSystemFactory.create(self.env, name="Other", code="other")
+        self.partners = self.Partner.create([{"name": f"Export Partner {index}"} for index in range(5)])
+        for index, partner in enumerate(self.partners):
+            partner.set_external_id("warehouse", f"W{index}")
+        self.partners[0].set_external_id("other", "O0")
+        self.ExternalId.search([("external_id", "=", "W1")]).write({"last_sync": "2026-01-02 03:04:05"})
+        self.ExternalId.search([("external_id", "=", "W4")]).active = False
+
+    def test_export_csv_in_chunks(self) -> None:
+        stream = io.StringIO()
+
+        count = self.ExternalId.export_external_ids(stream, system_codes=["warehouse"], chunk_size=2)
+
+        rows = list(csv.reader(io.StringIO(stream.getvalue())))
+        self.assertEqual(count, 4)
+        self.assertEqual(rows[0], ["res_model", "res_id", "system", "resource", "external_id", "last_sync"])
+        self.assertEqual([row[4] for row in rows[1:]], ["W0", "W1", "W2", "W3"])
+        self.assertEqual(
+            rows[2], ["res.partner", str(self.partners[1].id), "warehouse", "default", "W1", "2026-01-02 03:04:05"]
+        )
+
+    def test_export_jsonl_filtered_by_last_sync(self) -> None:
+        stream = io.StringIO()
+
+        count = self.ExternalId.export_external_ids(
+            stream,
+            file_format="jsonl",
+            res_models=["res.partner"],
+            last_sync_from="2026-01-01 00:00:00",
+            last_sync_to="2026-01-03 00:00:00",
+        )
+
+        self.assertEqual(count, 1)
+        row = json.loads(stream.getvalue())
+        self.assertEqual(row["external_id"], "W1")
+        self.assertEqual(row["system"], "warehouse")
+
+    def test_export_action_points_to_controller(self) -> None:
+        action = self.ExternalId.action_export_external_ids("jsonl", system_codes=["warehouse", "other"])
+        self.assertEqual(action["type"], "ir.actions.act_url")
+        self.assertEqual(action["url"], "/external_ids/export/jsonl?system=warehouse%2Cother")
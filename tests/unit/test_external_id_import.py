@@ -0,0 +1,93 @@
+import io
+import json
+
+from odoo.tests import new_test_user
+
+from ..common_imports import tagged, AccessError, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdImport(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.system = ExternalSystemFactory.create(self.env, name="Marketplace", code="marketplace", id_format=r"^\d+$")
+        self.partners = self.Partner.create(
+            [{"name": f"Import Partner {index}", "ref": f"REF{index}"} for index in range(4)]
+        )
+
+    def test_import_csv_in_chunks(self) -> None:
+        self.partners[3].set_external_id("marketplace", "9000")
+        data = "\n".join(
+            [
+                "key,external_id",
+                "REF0,1000",
+                "REF1,1001",
+                "UNKNOWN,1002",
+                "REF2,not-a-number",
+                "REF3,9000",
+            ]
+        )
+        progress: list[int] = []
+
+        report = self.ExternalId.import_external_ids(
+            io.BytesIO(data.encode()),
+            "marketplace",
+            "res.partner",
+            "ref",
+            chunk_size=2,
+            progress_callback=lambda r: progress.append(r["processed"]),
+        )
+
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(report["processed"], 5)
+        self.assertEqual((report["created"], report["updated"], report["unchanged"]), (2, 0, 1))
+        self.assertEqual(report["error_count"], 2)
+        self.assertEqual([error["line"] for error in report["errors"]], [4, 5])
+        self.assertEqual(self.partners[1].get_external_system_id("marketplace"), "1001")
+
+    def test_import_jsonl_reports_conflicts(self) -> None:
+        self.partners[0].set_external_id("marketplace", "2000")
+        lines = [
+            json.dumps({"key": "REF1", "external_id": "2000"}),
+            json.dumps({"key": "REF2", "external_id": "2001"}),
+            json.dumps({"key": "REF3", "external_id": "2001"}),
+        ]
+
+        report = self.ExternalId.import_external_ids(
+            io.StringIO("\n".join(lines)), "marketplace", "res.partner", "ref", file_format="jsonl"
+        )
+
+        self.assertEqual(report["created"], 0)
+        self.assertEqual(report["error_count"], 3)
+        self.assertFalse(self.partners[1].get_external_system_id("marketplace"))
+
+    def test_import_jsonl_rejects_non_object_lines(self) -> None:
+        lines = ["123", "[1]", '"x"', "{not json", json.dumps({"key": "REF0", "external_id": "3000"})]
+
+        report = self.ExternalId.import_external_ids(
+            io.StringIO("\n".join(lines)), "marketplace", "res.partner", "ref", file_format="jsonl"
+        )
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual([error["line"] for error in report["errors"]], [1, 2, 3, 4])
+        self.assertEqual(self.partners[0].get_external_system_id("marketplace"), "3000")
+
+    def test_import_requires_write_access(self) -> None:
+        user = new_test_user(self.env, login="external_ids_importer", groups="base.group_user")
+
+        with self.assertRaises(AccessError):
+            self.ExternalId.with_user(user).import_external_ids(
+                io.StringIO("key,external_id\nREF0,1000"), "marketplace", "res.partner", "ref"
+            )
+        self.assertFalse(self.partners[0].get_external_system_id("marketplace"))
+
+    def test_import_rejects_models_without_external_ids(self) -> None:
+        company = self.env.company
+
+        with self.assertRaises(ValueError):
+            self.ExternalId.import_external_ids(
+                io.StringIO(f"key,external_id\n{company.name},1000"), "marketplace", "res.company", "name"
+            )
+        self.assertFalse(self.ExternalId.search([("res_model", "=", "res.company")]))
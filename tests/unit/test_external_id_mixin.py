@@ -1,4 +1,6 @@
-from ..common_imports import tagged, UNIT_TAGS
+from odoo.tests import new_test_user
+
+from ..common_imports import tagged, AccessError, ValidationError, UNIT_TAGS
 from ..fixtures.base import UnitTestCase
 from ..fixtures.factories import ExternalSystemFactory
 
@@ -135,3 +137,206 @@ class TestExternalIdMixin(UnitTestCase):
 
         result = partner.get_external_system_id("discord")
         self.assertFalse(result)
+
+    def test_search_by_external_ids(self) -> None:
+        partner1 = self.Partner.create({"name": "Batch Test 1"})
+        partner2 = self.Partner.create({"name": "Batch Test 2"})
+        partner3 = self.Partner.create({"name": "Batch Test 3"})
+
+        partner1.set_external_id("discord", "100000000000000001")
+        partner2.set_external_id("discord", "100000000000000002")
+        partner3.set_external_id("discord", "100000000000000003")
+        self.ExternalId.search(
+            [("res_model", "=", "res.partner"), ("res_id", "=", partner3.id)]
+        ).active = False
+
+        result = self.Partner.search_by_external_ids(
+            "discord",
+            ["100000000000000002", " 100000000000000001 ", "100000000000000003", "999999999999999999"],
+        )
+
+        self.assertEqual(list(result["records"]), ["100000000000000002", "100000000000000001"])
+        self.assertEqual(result["records"]["100000000000000001"], partner1)
+        self.assertEqual(result["records"]["100000000000000002"], partner2)
+        self.assertEqual(result["archived"], ["100000000000000003"])
+        self.assertEqual(result["missing"], ["999999999999999999"])
+
+        self.assertEqual(self.Employee.search_by_external_ids("discord", ["100000000000000001"])["records"], {})
+
+        invalid_system = self.Partner.search_by_external_ids("invalid", ["123"])
+        self.assertEqual(invalid_system["missing"], ["123"])
+
+    def test_set_external_ids_bulk_upsert(self) -> None:
+        partners = self.Partner.create([{"name": f"Bulk Partner {index}"} for index in range(3)])
+        partners[0].set_external_id("discord", "200000000000000000")
+
+        counts = self.Partner.set_external_ids(
+            "discord",
+            {
+                partners[0]: "200000000000000000",
+                partners[1].id: "200000000000000001",
+                partners[2].id: " 200000000000000002 ",
+            },
+        )
+        self.assertEqual(counts, {"created": 2, "updated": 0, "unchanged": 1})
+        self.assertEqual(partners[2].get_external_system_id("discord"), "200000000000000002")
+
+        counts = self.Partner.set_external_ids("discord", {partners[1].id: "200000000000000011"})
+        self.assertEqual(counts, {"created": 0, "updated": 1, "unchanged": 0})
+        self.assertEqual(partners[1].get_external_system_id("discord"), "200000000000000011")
+
+    def test_set_external_ids_validates_whole_batch(self) -> None:
+        self.discord_system.id_format = r"^\d{18}$"
+        partners = self.Partner.create([{"name": "Valid"}, {"name": "Invalid"}])
+
+        with self.assertRaises(ValidationError) as context:
+            self.Partner.set_external_ids("discord", {partners[0].id: "300000000000000000", partners[1].id: "bad"})
+        self.assertIn("bad", str(context.exception))
+        self.assertFalse(partners[0].get_external_system_id("discord"))
+
+        partners[0].set_external_id("discord", "300000000000000000")
+        with self.assertRaises(ValidationError):
+            self.Partner.set_external_ids("discord", {partners[1].id: "300000000000000000"})
+
+        with self.assertRaises(ValueError):
+            self.Partner.set_external_ids("nonexistent_system", {partners[0].id: "1"})
+
+    def test_set_external_ids_rejects_missing_records(self) -> None:
+        partner = self.Partner.create({"name": "Existing"})
+        missing_id = self.Partner.search([], order="id desc", limit=1).id + 1000
+
+        with self.assertRaises(ValidationError) as context:
+            self.Partner.set_external_ids(
+                "discord", {partner.id: "400000000000000000", missing_id: "400000000000000001"}
+            )
+        self.assertIn(str(missing_id), str(context.exception))
+        self.assertFalse(self.ExternalId.search([("res_model", "=", "res.partner"), ("res_id", "=", missing_id)]))
+
+    def test_set_external_ids_requires_write_access(self) -> None:
+        partner = self.Partner.create({"name": "Read Only"})
+        user = new_test_user(self.env, login="external_ids_reader", groups="base.group_user")
+
+        with self.assertRaises(AccessError):
+            self.Partner.with_user(user).set_external_ids("discord", {partner.id: "500000000000000000"})
+        self.assertFalse(partner.get_external_system_id("discord"))
+
+    def test_external_ids_relation_is_scoped_to_model(self) -> None:
+        partner = self.Partner.create({"name": "Scoped Partner"})
+        partner.set_external_id("discord", "400000000000000000")
+        self.ExternalId.create(
+            {
+                "res_model": "hr.employee",
+                "res_id": partner.id,
+                "system_id": self.discord_system.id,
+                "external_id": "400000000000000001",
+            }
+        )
+
+        self.env.invalidate_all()
+        self.assertEqual(partner.external_ids.mapped("external_id"), ["400000000000000000"])
+        self.assertEqual(partner.read(["external_ids"])[0]["external_ids"], partner.external_ids.ids)
+
+    def test_get_external_urls_for_recordset(self) -> None:
+        self.shopify_system.url = "https://shop.example.com"
+        self.env["external.system.url"].create(
+            {
+                "name": "Admin",
+                "code": "admin",
+                "system_id": self.shopify_system.id,
+                "template": "{base}/admin/{model}/{id}?name={name}",
+            }
+        )
+        partners = self.Partner.create([{"name": f"Url Partner {index}"} for index in range(3)])
+        partners[0].set_external_id("shopify", "GID123")
+        partners[1].set_external_id("shopify", "456")
+
+        urls = partners.get_external_urls("shopify", "admin")
+
+        self.assertEqual(
+            urls,
+            {
+                partners[0].id: "https://shop.example.com/admin/res.partner/GID123?name=Url Partner 0",
+                partners[1].id: "https://shop.example.com/admin/res.partner/456?name=Url Partner 1",
+            },
+        )
+        self.assertEqual(partners[1].get_external_url("shopify", "admin"), urls[partners[1].id])
+        self.assertIsNone(partners[2].get_external_url("shopify", "admin"))
+        self.assertEqual(partners.get_external_urls("shopify", "missing"), {})
+        self.assertEqual(partners.get_external_system_ids("shopify"), {partners[0].id: "GID123", partners[1].id: "456"})
+
+    def test_resolve_external_id_batch(self) -> None:
+        partners = self.Partner.create([{"name": "Resolve A"}, {"name": "Resolve B"}])
+        partners[0].set_external_id("discord", "600000000000000000")
+
+        results = self.ExternalId.resolve_external_id_batch(
+            [
+                {"system": "discord", "model": "res.partner", "external_ids": ["600000000000000000", "1"]},
+                {"system": "discord", "external_ids": ["600000000000000000"]},
+                {"system": "discord", "model": "res.partner", "ids": [partners[0].id, partners[1].id]},
+                {"system": "nonexistent", "external_ids": ["1"]},
+                {"system": "discord", "model": "res.currency", "ids": [1]},
+            ]
+        )
+
+        self.assertEqual(
+            results[0], {"records": {"600000000000000000": partners[0].id}, "archived": [], "missing": ["1"]}
+        )
+        self.assertEqual(results[1]["records"], {"600000000000000000": ["res.partner", partners[0].id]})
+        self.assertEqual(
+            results[2], {"external_ids": {str(partners[0].id): "600000000000000000"}, "missing": [partners[1].id]}
+        )
+        self.assertIn("error", results[3])
+        self.assertIn("error", results[4])
+
+    def test_resolve_external_id_batch_rejects_malformed_entries(self) -> None:
+        partner = self.Partner.create({"name": "Resolve Shapes"})
+        partner.set_external_id("discord", "600000000000000001")
+
+        results = self.ExternalId.resolve_external_id_batch(
+            [
+                {"system": "discord", "external_ids": "600000000000000001"},
+                {"system": "discord", "external_ids": [{"id": 1}]},
+                {"system": "discord", "model": "res.partner", "ids": ["abc", partner.id]},
+                {"system": ["discord"], "external_ids": ["1"]},
+                {"system": "discord", "model": "res.partner", "ids": [str(partner.id)]},
+                {"system": "discord", "external_ids": [600000000000000001]},
+            ]
+        )
+
+        self.assertEqual([("error" in result) for result in results], [True, True, True, True, False, False])
+        self.assertEqual(results[4]["external_ids"], {str(partner.id): "600000000000000001"})
+        self.assertEqual(results[5]["records"], {"600000000000000001": ["res.partner", partner.id]})
+
+    def test_search_external_id_filters(self) -> None:
+        partners = self.Partner.create([{"name": f"Filter {index}"} for index in range(3)])
+        partners[0].set_external_id("discord", "700000000000000000")
+        partners[1].set_external_id("shopify", "700000000000000000")
+        partners[1].set_external_id("discord", "700000000000000001")
+        self.env["hr.employee"].create({"name": "Filter Employee"}).set_external_id("discord", "700000000000000002")
+
+        def search(domain: list) -> "odoo.model.res_partner":
+            return self.Partner.search([("id", "in", partners.ids), *domain])
+
+        self.assertEqual(search([("has_external_id", "=", True)]), partners[:2])
+        self.assertEqual(search([("has_external_id", "=", False)]), partners[2])
+        self.assertEqual(search([("external_system_codes", "=", "shopify")]), partners[1])
+        self.assertEqual(search([("external_system_codes", "in", ["discord", "shopify"])]), partners[:2])
+        self.assertEqual(search([("external_system_codes", "!=", "shopify")]), partners[0] | partners[2])
+        self.assertEqual(search([("external_system_codes", "ilike", "shop")]), partners[1])
+        self.assertEqual(search([("external_id_value", "=", "700000000000000000")]), partners[:2])
+        self.assertEqual(search([("external_id_value", "=", "discord:700000000000000000")]), partners[0])
+        self.assertEqual(search([("external_id_value", "ilike", "discord:0001")]), partners[1])
+        self.assertFalse(search([("external_id_value", "=", "700000000000000002")]))
+
+        partners[1].external_ids.filtered(lambda record: record.system_id == self.shopify_system).active = False
+        self.assertFalse(search([("external_system_codes", "=", "shopify")]))
+
+    def test_external_id_filter_fields_compute(self) -> None:
+        partner = self.Partner.create({"name": "Filter Compute"})
+        self.assertFalse(partner.has_external_id)
+        partner.set_external_id("discord", "710000000000000000")
+        partner.set_external_id("shopify", "710000000000000001")
+        partner.invalidate_recordset()
+        self.assertTrue(partner.has_external_id)
+        self.assertEqual(partner.external_system_codes, "discord, shopify")
+        self.assertEqual(partner.external_id_value, "discord:710000000000000000, shopify:710000000000000001")
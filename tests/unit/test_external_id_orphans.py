@@ -0,0 +1,53 @@
+from odoo.tools import SQL
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdOrphans(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.system = ExternalSystemFactory.create(self.env, name="Orphans", code="orphans")
+        self.partners = self.Partner.create([{"name": f"Orphan {index}"} for index in range(3)])
+        self.Partner.set_external_ids(
+            "orphans", {partner.id: f"O{index}" for index, partner in enumerate(self.partners)}
+        )
+        self.employee = self.Employee.create({"name": "Orphan Employee"})
+        self.employee.set_external_id("orphans", "E1")
+        # Rows left behind by a deleted record and by an uninstalled module
+        self.env.cr.execute(SQL("DELETE FROM res_partner WHERE id = ANY(%s)", self.partners[:2].ids))
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id (res_model, res_id, system_id, resource, external_id, active)
+                VALUES ('x_uninstalled.model', 1, %s, 'default', 'U1', TRUE)
+                """,
+                self.system.id,
+            )
+        )
+        self.env.invalidate_all()
+
+    def _ids(self) -> "odoo.model.external_id":
+        return self.ExternalId.with_context(active_test=False).search([("system_id", "=", self.system.id)])
+
+    def test_orphans_are_archived(self) -> None:
+        reports = self.ExternalId.cleanup_orphan_external_ids(batch_size=1)
+
+        self.assertEqual(reports["res.partner"]["archived"], 2)
+        self.assertEqual(reports["x_uninstalled.model"]["archived"], 1)
+        self.assertEqual(reports["hr.employee"]["archived"], 0)
+        archived = self._ids().filtered(lambda record: not record.active)
+        self.assertEqual(sorted(archived.mapped("external_id")), ["O0", "O1", "U1"])
+
+        # Archived orphans are not picked up again
+        reports = self.ExternalId.cleanup_orphan_external_ids()
+        self.assertEqual(reports["res.partner"]["processed"], 0)
+
+    def test_orphans_are_deleted(self) -> None:
+        self.env["ir.config_parameter"].sudo().set_param("external_ids.orphan_action", "delete")
+        self.ExternalId._cron_cleanup_orphans()
+
+        self.assertEqual(sorted(self._ids().mapped("external_id")), ["E1", "O2"])
+        self.assertEqual(self.partners[2].get_external_system_id("orphans"), "O2")
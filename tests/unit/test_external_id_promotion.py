@@ -0,0 +1,92 @@
+from ..common_imports import tagged, UNIT_TAGS, ValidationError
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdPromotion(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.Promotion = self.env["external.id.promotion"]
+        self.system = ExternalSystemFactory.create(self.env, name="Promoted", code="promoted")
+        self.partners = self.Partner.create([{"name": "Promoted A"}, {"name": "Promoted B"}])
+        self.partners[0].set_external_id("promoted", "A1")
+
+    def _promote(self, resource: str = "default") -> "odoo.model.external_id_promotion":
+        promotion = self.Promotion.create(
+            {"system_id": self.system.id, "model_id": self.env["ir.model"]._get_id("res.partner"), "resource": resource}
+        )
+        # The registry was reloaded with the new field: browse again from the new model class
+        self.Partner = self.env["res.partner"]
+        self.partners = self.Partner.browse(self.partners.ids)
+        return promotion
+
+    def test_promotion_creates_indexed_column(self) -> None:
+        promotion = self._promote()
+        self.assertEqual(promotion.field_name, "x_ext_promoted")
+        self.assertEqual(self.partners[0].x_ext_promoted, "A1")
+        self.assertFalse(self.partners[1].x_ext_promoted)
+        self.env.cr.execute(
+            "SELECT indexdef FROM pg_indexes WHERE tablename = 'res_partner' AND indexdef LIKE '%x_ext_promoted%'"
+        )
+        self.assertTrue(self.env.cr.fetchall())
+
+    def test_column_follows_external_ids(self) -> None:
+        self._promote()
+        partner = self.partners[1]
+        partner.set_external_id("promoted", "B1")
+        self.assertEqual(partner.x_ext_promoted, "B1")
+        self.assertEqual(self.Partner.search([("x_ext_promoted", "=", "B1")]), partner)
+
+        external_id = partner.external_ids.filtered(lambda record: record.system_id == self.system)
+        external_id.external_id = "B2"
+        self.assertEqual(partner.x_ext_promoted, "B2")
+        external_id.active = False
+        self.assertFalse(partner.x_ext_promoted)
+        external_id.active = True
+        self.assertEqual(partner.x_ext_promoted, "B2")
+        # Only archived external IDs can be deleted
+        external_id.active = False
+        external_id.unlink()
+        self.assertFalse(partner.x_ext_promoted)
+
+        self.Partner.set_external_ids("promoted", {self.partners[0].id: "A9", partner.id: "B9"})
+        self.assertEqual(self.partners.mapped("x_ext_promoted"), ["A9", "B9"])
+
+    def test_other_resources_are_not_promoted(self) -> None:
+        self._promote()
+        self.partners[1].set_external_id("promoted", "B1", resource="variant")
+        self.assertFalse(self.partners[1].x_ext_promoted)
+
+    def test_reads_use_promoted_column(self) -> None:
+        self._promote()
+        self.assertEqual(self.partners[0].get_external_system_id("promoted"), "A1")
+        self.assertEqual(self.partners.get_external_system_ids("promoted"), {self.partners[0].id: "A1"})
+        self.env.invalidate_all()
+        with self.assertQueryCount(1):
+            self.partners[0].get_external_system_id("promoted")
+
+    def test_reads_skip_deleted_records(self) -> None:
+        self._promote()
+        deleted = self.Partner.create({"name": "Promoted Gone"})
+        deleted_id = deleted.id
+        deleted.unlink()
+        archived = self.partners[1]
+        archived.set_external_id("promoted", "B1")
+        archived.active = False
+
+        records = self.Partner.browse([self.partners[0].id, archived.id, deleted_id])
+        self.assertEqual(records.get_external_system_ids("promoted"), {self.partners[0].id: "A1", archived.id: "B1"})
+
+    def test_unlink_removes_column(self) -> None:
+        promotion = self._promote()
+        promotion.unlink()
+        Partner = self.env["res.partner"]
+        self.assertNotIn("x_ext_promoted", Partner._fields)
+        self.assertEqual(Partner.browse(self.partners[0].id).get_external_system_id("promoted"), "A1")
+
+    def test_only_mixin_models(self) -> None:
+        with self.assertRaises(ValidationError):
+            self.Promotion.create(
+                {"system_id": self.system.id, "model_id": self.env["ir.model"]._get_id("res.country")}
+            )
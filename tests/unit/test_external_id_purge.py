@@ -0,0 +1,80 @@
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdPurge(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.system = ExternalSystemFactory.create(self.env, name="Retired", code="retired")
+        self.other_system = ExternalSystemFactory.create(self.env, name="Kept", code="kept")
+        self.partners = self.Partner.create([{"name": f"Purge {index}"} for index in range(5)])
+        for code, prefix in (("retired", "R"), ("kept", "K")):
+            self.Partner.set_external_ids(
+                code, {partner.id: f"{prefix}{index}" for index, partner in enumerate(self.partners)}
+            )
+        self.employee = self.Employee.create({"name": "Purge Employee"})
+        self.employee.set_external_id("retired", "E1")
+
+    def _ids(self, system: "odoo.model.external_system") -> "odoo.model.external_id":
+        return self.ExternalId.with_context(active_test=False).search([("system_id", "=", system.id)])
+
+    def test_purge_system_ids(self) -> None:
+        self._ids(self.system)[:2].active = False
+        self.assertTrue(self.ExternalId.get_record_by_external_id("retired", "R3"))
+        progress = []
+
+        report = self.ExternalId.purge_system_ids(
+            "retired", model="res.partner", batch_size=2, progress_callback=lambda report: progress.append(dict(report))
+        )
+
+        self.assertEqual(report, {"processed": 5, "archived": 3, "unarchived": 0, "deleted": 5, "skipped": 0})
+        self.assertEqual([step["processed"] for step in progress], [2, 4, 5])
+        self.assertEqual(self._ids(self.system).mapped("res_model"), ["hr.employee"])
+        self.assertEqual(len(self._ids(self.other_system)), 5)
+        self.assertFalse(self.ExternalId.get_record_by_external_id("retired", "R3"))
+        self.assertFalse(self.partners[0].get_external_system_id("retired"))
+        changes = self.env["external.id.change"].search(
+            [("system_id", "=", self.system.id), ("operation", "=", "unlink")]
+        )
+        self.assertEqual(len(changes), 5)
+
+    def test_purge_older_than(self) -> None:
+        stale = self._ids(self.system).filtered(lambda record: record.external_id == "R1")
+        stale.last_sync = "2020-01-01 00:00:00"
+        self._ids(self.system).filtered(lambda record: record.external_id != "R1").last_sync = "2030-01-01 00:00:00"
+
+        report = self.ExternalId.purge_system_ids(self.system, older_than="2025-01-01 00:00:00")
+
+        self.assertEqual(report["deleted"], 1)
+        self.assertFalse(stale.exists())
+
+    def test_archive_and_unarchive_system_ids(self) -> None:
+        self.system.active = False
+        report = self.ExternalId.archive_system_ids("retired")
+        self.assertEqual(report["archived"], 6)
+        self.assertFalse(any(self._ids(self.system).mapped("active")))
+        self.assertTrue(all(self._ids(self.other_system).mapped("active")))
+
+        report = self.ExternalId.archive_system_ids("retired", model="hr.employee", active=True)
+        self.assertEqual(report["unarchived"], 1)
+        self.assertEqual(self._ids(self.system).filtered("active").res_model, "hr.employee")
+
+    def test_rows_left_behind_are_reported(self) -> None:
+        first = self._ids(self.system).sorted("id")[0]
+
+        def reactivate_first(report: dict) -> None:
+            # Stands in for a row that was locked when the walk passed it
+            if report["processed"] == 2:
+                first.active = True
+                first.flush_recordset()
+
+        report = self.ExternalId.archive_system_ids("retired", batch_size=2, progress_callback=reactivate_first)
+
+        self.assertEqual(report["skipped"], 1)
+        self.assertTrue(first.active)
+
+    def test_unknown_system(self) -> None:
+        with self.assertRaises(ValueError):
+            self.ExternalId.purge_system_ids("missing")
@@ -0,0 +1,83 @@
+from unittest.mock import patch
+
+from odoo.addons.external_ids.models.call_stats import FLUSH_INTERVAL_PARAM, INSTRUMENTATION_PARAM, get_call_stats
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdStats(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.Stats = self.env["external.id.stats"]
+        self.system = ExternalSystemFactory.create(self.env, name="Stats", code="stats")
+        self.partner = self.Partner.create({"name": "Stats Partner"})
+        self.partner.set_external_id("stats", "S1")
+        self.params = self.env["ir.config_parameter"].sudo()
+        self.params.set_param(FLUSH_INTERVAL_PARAM, "3600")
+        self.call_stats = get_call_stats(self.env.cr.dbname)
+        self.call_stats.drain()
+
+    def test_disabled_by_default(self) -> None:
+        self.partner.get_external_system_id("stats")
+        self.assertEqual(self.call_stats.entries, {})
+
+    def test_calls_are_aggregated(self) -> None:
+        self.params.set_param(INSTRUMENTATION_PARAM, "True")
+        for _attempt in range(3):
+            self.env.invalidate_all()
+            self.partner.get_external_system_id("stats")
+        self.ExternalId.get_record_by_external_id(system_code="stats", external_id="S1")
+
+        calls, queries, duration = self.call_stats.entries[("get_external_system_id", "res.partner", "stats")]
+        self.assertEqual(calls, 3)
+        self.assertGreaterEqual(queries, 3)
+        self.assertGreater(duration, 0)
+        self.assertIn(("get_record_by_external_id", "external.id", "stats"), self.call_stats.entries)
+
+    def test_merge_call_stats(self) -> None:
+        key = ("search_by_external_id", "res.partner", "stats")
+        self.Stats._merge_call_stats({key: [2, 10, 0.5]})
+        self.Stats._merge_call_stats({key: [3, 5, 0.25], ("get_external_url", "res.partner", ""): [1, 1, 0.1]})
+
+        stats = self.Stats.search([("method", "=", "search_by_external_id")])
+        self.assertEqual((stats.calls, stats.query_count), (5, 15))
+        self.assertAlmostEqual(stats.total_time, 0.75)
+        self.assertEqual(stats.queries_per_call, 3.0)
+        self.assertAlmostEqual(stats.time_per_call, 150.0)
+        self.assertEqual(self.Stats.search_count([]), 2)
+
+    def test_system_code_is_read_by_name(self) -> None:
+        self.params.set_param(INSTRUMENTATION_PARAM, "True")
+        self.ExternalId.get_stale_external_ids("2026-03-01", "stats")
+        self.ExternalId.get_stale_external_ids("2026-03-01")
+
+        self.assertIn(("get_stale_external_ids", "external.id", "stats"), self.call_stats.entries)
+        self.assertIn(("get_stale_external_ids", "external.id", ""), self.call_stats.entries)
+        self.assertEqual(len(self.call_stats.entries), 2)
+
+    def test_flush_merges_missing_system_codes(self) -> None:
+        self.call_stats.add(("get_external_url", "res.partner", None), 1, 0.1)
+        self.call_stats.add(("get_external_url", "res.partner", ""), 2, 0.2)
+
+        self.Stats._flush_call_stats(self.call_stats)
+
+        stats = self.Stats.search([("method", "=", "get_external_url")])
+        self.assertEqual((stats.system_code, stats.calls, stats.query_count), ("", 2, 3))
+        self.assertEqual(self.call_stats.entries, {})
+
+    def test_flush_when_due(self) -> None:
+        self.params.set_param(INSTRUMENTATION_PARAM, "True")
+        self.params.set_param(FLUSH_INTERVAL_PARAM, "0")
+        with patch.object(type(self.Stats), "_flush_call_stats", autospec=True) as flush:
+            self.partner.get_external_url("stats")
+        self.assertTrue(flush.called)
+        self.assertIs(flush.call_args.args[1], self.call_stats)
+
+    def test_invalid_flush_interval(self) -> None:
+        self.params.set_param(INSTRUMENTATION_PARAM, "True")
+        self.params.set_param(FLUSH_INTERVAL_PARAM, "hourly")
+        self.assertEqual(self.partner.get_external_system_id("stats"), "S1")
+        self.assertIn(("get_external_system_id", "res.partner", "stats"), self.call_stats.entries)
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from odoo import fields, sql_db
+from odoo.tests import new_test_user
+from odoo.tools import SQL
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalSyncJob(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.Job = self.env["external.sync.job"]
+        self.system = ExternalSystemFactory.create(
+            self.env, name="Queue", code="queue", sync_batch_size=2, sync_retry_delay=60
+        )
+        partners = self.Partner.create([{"name": f"Queue {index}"} for index in range(3)])
+        self.Partner.set_external_ids("queue", {partner.id: f"Q{index}" for index, partner in enumerate(partners)})
+        self.external_ids = self.ExternalId.search([("system_id", "=", self.system.id)], order="id")
+
+    def _patch_adapter(self, side_effect):
+        return patch.object(
+            type(self.ExternalSystem), "_sync_adapter_timestamp", autospec=True, side_effect=side_effect
+        )
+
+    def _make_due(self) -> None:
+        self.Job.search([("system_id", "=", self.system.id)]).next_attempt_at = fields.Datetime.now()
+
+    def test_enqueue_dedupes_pending_jobs(self) -> None:
+        jobs = self.external_ids.enqueue_sync()
+        self.assertEqual(len(jobs), 3)
+        self.assertFalse(self.external_ids.enqueue_sync())
+        self.assertEqual(self.Job.search_count([("system_id", "=", self.system.id)]), 3)
+
+    def test_batches_are_processed(self) -> None:
+        self.external_ids.enqueue_sync()
+        with self._patch_adapter(lambda system, external_ids: {}) as adapter:
+            self.Job._cron_process_jobs()
+
+        self.assertEqual([len(call.args[1]) for call in adapter.call_args_list], [2, 1])
+        jobs = self.Job.search([("system_id", "=", self.system.id)])
+        self.assertEqual(set(jobs.mapped("state")), {"done"})
+        self.assertTrue(all(self.external_ids.mapped("last_sync")))
+
+    def test_failures_are_retried_with_backoff(self) -> None:
+        failing = self.external_ids[0]
+        self.external_ids.enqueue_sync()
+        with self._patch_adapter(lambda system, external_ids: {failing.id: "rate limited"}):
+            self.Job._cron_process_jobs()
+            job = self.Job.search([("external_id_id", "=", failing.id)])
+            self.assertEqual((job.state, job.attempts, job.last_error), ("pending", 1, "rate limited"))
+            self.assertAlmostEqual(
+                job.next_attempt_at, job.date_started + timedelta(seconds=60), delta=timedelta(seconds=1)
+            )
+            self.assertFalse(failing.last_sync)
+
+            self._make_due()
+            self.Job._cron_process_jobs()
+            self.assertEqual(job.attempts, 2)
+            self.assertAlmostEqual(
+                job.next_attempt_at, job.date_started + timedelta(seconds=120), delta=timedelta(seconds=1)
+            )
+        self.assertTrue(self.external_ids[1].last_sync)
+
+    def test_job_fails_after_max_attempts(self) -> None:
+        self.system.sync_max_attempts = 2
+        self.external_ids[0].enqueue_sync()
+        with self._patch_adapter(ConnectionError("unreachable")):
+            self.Job._cron_process_jobs()
+            self._make_due()
+            self.Job._cron_process_jobs()
+
+        job = self.Job.search([("system_id", "=", self.system.id)])
+        self.assertEqual((job.state, job.attempts), ("failed", 2))
+        self.assertIn("unreachable", job.last_error)
+
+        job.action_retry()
+        self.assertEqual((job.state, job.attempts), ("pending", 0))
+        with self._patch_adapter(lambda system, external_ids: {}):
+            self.Job._cron_process_jobs()
+        self.assertEqual(job.state, "done")
+
+    def test_rate_limit(self) -> None:
+        self.system.write({"sync_rate_limit": 2, "sync_batch_size": 1})
+        self.external_ids.enqueue_sync()
+        with self._patch_adapter(lambda system, external_ids: {}) as adapter:
+            self.Job._cron_process_jobs()
+            # Batches started within the same second are each counted
+            self.assertEqual(adapter.call_count, 2)
+            self.assertEqual(
+                self.Job.search_count([("system_id", "=", self.system.id), ("state", "=", "pending")]), 1
+            )
+
+            self.Job._cron_process_jobs()
+            self.assertEqual(adapter.call_count, 2)
+
+    def test_rate_limit_counts_retried_batches(self) -> None:
+        self.system.write({"sync_rate_limit": 2, "sync_batch_size": 1})
+        self.external_ids[0].enqueue_sync()
+        with self._patch_adapter(lambda system, external_ids: {external_ids.id: "busy"}) as adapter:
+            self.Job._cron_process_jobs()
+            self._make_due()
+            self.Job._cron_process_jobs()
+            self.assertEqual(adapter.call_count, 2)
+
+            # The retry rewrote date_started, but both starts still count
+            self._make_due()
+            self.Job._cron_process_jobs()
+            self.assertEqual(adapter.call_count, 2)
+
+    def test_concurrency_slots(self) -> None:
+        self.external_ids.enqueue_sync()
+        self.env.flush_all()
+        # Another worker holds the system's only slot
+        with sql_db.db_connect(self.env.cr.dbname).cursor() as other_cr:
+            other_cr.execute(SQL("SELECT pg_advisory_xact_lock(hashtext(%s), 0)", f"external_sync:{self.system.id}"))
+            with self._patch_adapter(lambda system, external_ids: {}) as adapter:
+                self.Job._cron_process_jobs(time_budget=1)
+                self.assertFalse(adapter.called)
+
+                self.system.sync_max_concurrency = 2
+                self.Job._cron_process_jobs(time_budget=1)
+                self.assertEqual(adapter.call_count, 2)
+
+    def test_worker_crons_follow_concurrency(self) -> None:
+        self.assertEqual(len(self.Job._get_worker_crons()), 1)
+        self.system.sync_max_concurrency = 3
+        workers = self.Job._get_worker_crons()
+        self.assertEqual(len(workers), 3)
+        self.assertEqual(set(workers.mapped("code")), {"model._cron_process_jobs()"})
+
+        self.system.active = False
+        self.assertEqual(len(self.Job._get_worker_crons()), 1)
+
+    def test_worker_crons_follow_main_cron(self) -> None:
+        main = self.Job._get_worker_crons()
+        user = new_test_user(self.env, login="external_sync_cron", groups="base.group_system")
+        main.write({"user_id": user.id, "priority": 3})
+        self.system.sync_max_concurrency = 3
+        workers = self.Job._get_worker_crons()
+        self.assertEqual(set(workers.mapped("user_id")), {user})
+        self.assertEqual(set(workers.mapped("priority")), {3})
+
+        main.write({"user_id": self.env.ref("base.user_root").id, "priority": 7})
+        self.assertEqual(set(workers.mapped("user_id")), {self.env.ref("base.user_root")})
+        self.assertEqual(set(workers.mapped("priority")), {7})
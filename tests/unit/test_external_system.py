@@ -1,3 +1,5 @@
+from odoo.tools import SQL
+
 from ..common_imports import tagged, ValidationError, UNIT_TAGS
 from ..fixtures.base import UnitTestCase
 from ..fixtures.factories import ExternalSystemFactory, ExternalIdFactory
@@ -33,6 +35,17 @@ class TestExternalSystem(UnitTestCase):
         with self.assertRaises(ValidationError):
             ExternalSystemFactory.create(self.env, name="Unique System", code="different_code")
 
+    def test_invalid_id_format(self) -> None:
+        with self.assertRaises(ValidationError):
+            ExternalSystemFactory.create(self.env, code="bad_format", id_format="[0-9")
+
+        system = ExternalSystemFactory.create(self.env, code="legacy_format")
+        # Bypass the constraint, like a row saved before it existed
+        self.env.flush_all()
+        self.env.cr.execute(SQL("UPDATE external_system SET id_format = '[0-9' WHERE id = %s", system.id))
+        system.invalidate_recordset(["id_format"])
+        self.assertIsNone(system._get_id_pattern())
+
     def test_external_id_count(self) -> None:
         system = ExternalSystemFactory.create(self.env, name="Shopify", code="shopify")
         self.assertEqual(system.external_id_count, 0)
@@ -73,3 +86,49 @@ class TestExternalSystem(UnitTestCase):
 
         with self.assertRaises(ValidationError):
             system.unlink()
+
+    def test_resolve_system_is_cached_and_invalidated(self) -> None:
+        self.assertIsNone(self.ExternalSystem._resolve_system("cached"))
+
+        system = ExternalSystemFactory.create(self.env, name="Cached", code="cached", id_format=r"^\d+$")
+        info = self.ExternalSystem._resolve_system("cached")
+        self.assertEqual(info.id, system.id)
+        self.assertEqual(info.id_prefix, "TEST-")
+        self.assertEqual(info.get_invalid_external_ids(["123", "abc"]), ["abc"])
+
+        with self.assertQueryCount(0):
+            self.ExternalSystem._resolve_system("cached")
+
+        system.id_prefix = "C-"
+        self.assertEqual(self.ExternalSystem._resolve_system("cached").id_prefix, "C-")
+
+        system.active = False
+        self.assertIsNone(self.ExternalSystem._resolve_system("cached"))
+        self.assertFalse(self.ExternalSystem._get_system_info("cached").active)
+
+    def test_external_id_count_grouped(self) -> None:
+        systems = ExternalSystemFactory.create(self.env, name="Count A", code="count_a") | ExternalSystemFactory.create(
+            self.env, name="Count B", code="count_b"
+        )
+        partners = self.Partner.create([{"name": f"Count Partner {index}"} for index in range(3)])
+        employee = self.Employee.create({"name": "Count Employee"})
+        for index, partner in enumerate(partners):
+            ExternalIdFactory.create(
+                self.env, res_model="res.partner", res_id=partner.id, system_id=systems[0].id, external_id=f"P{index}"
+            )
+        ExternalIdFactory.create(
+            self.env, res_model="hr.employee", res_id=employee.id, system_id=systems[0].id, external_id="E1"
+        )
+
+        systems.mapped("external_id_count")
+        self.env.invalidate_all()
+        with self.assertQueryCount(1):
+            self.assertEqual(systems.mapped("external_id_count"), [4, 0])
+
+        breakdown = systems.get_external_id_breakdown()
+        self.assertEqual(breakdown[systems[0].id], {"res.partner": 3, "hr.employee": 1})
+        self.assertEqual(breakdown[systems[1].id], {})
+        self.assertEqual(
+            systems[0].get_external_id_breakdown(("res_model", "resource"))[systems[0].id][("res.partner", "default")],
+            3,
+        )
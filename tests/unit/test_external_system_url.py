@@ -0,0 +1,67 @@
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalSystemUrl(UnitTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.SystemUrl = self.env["external.system.url"]
+        self.system = ExternalSystemFactory.create(self.env, name="Storefront", code="storefront")
+        self.url = self.SystemUrl.create(
+            {
+                "name": "Store",
+                "code": "store",
+                "system_id": self.system.id,
+                "template": "{base}/products/{id}",
+            }
+        )
+
+    def test_renderer_is_cached(self) -> None:
+        renderer = self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+        self.assertEqual(renderer.tokens, frozenset({"base", "id"}))
+        self.assertEqual(renderer.render({"base": "https://x", "id": "7"}), "https://x/products/7")
+
+        with self.assertQueryCount(0):
+            self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+
+    def test_renderer_invalidated_on_write_archive_and_rename(self) -> None:
+        self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+
+        self.url.template = "{base}/p/{id}"
+        renderer = self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+        self.assertEqual(renderer.render({"base": "b", "id": "1"}), "b/p/1")
+
+        wizard = self.env["external.system.url.rename.wizard"].create({"url_id": self.url.id, "new_code": "shop"})
+        wizard.action_rename()
+        self.assertIsNone(self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner"))
+        self.assertTrue(self.SystemUrl._get_url_renderer(self.system.id, "shop", "res.partner"))
+
+        self.url.active = False
+        self.assertIsNone(self.SystemUrl._get_url_renderer(self.system.id, "shop", "res.partner"))
+
+    def test_model_specific_template_wins(self) -> None:
+        self.SystemUrl.create(
+            {
+                "name": "Partner Store",
+                "code": "store",
+                "system_id": self.system.id,
+                "res_model_id": self.env["ir.model"]._get_id("res.partner"),
+                "template": "{base}/customers/{id}",
+                "resource": "customer",
+            }
+        )
+
+        partner_renderer = self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+        self.assertEqual(partner_renderer.template, "{base}/customers/{id}")
+        self.assertEqual(partner_renderer.resource, "customer")
+        self.assertEqual(
+            self.SystemUrl._get_url_renderer(self.system.id, "store", "hr.employee").template, "{base}/products/{id}"
+        )
+
+    def test_renderer_falls_back_to_format(self) -> None:
+        self.url.template = "{base}/{id!s}/{{literal}}"
+        renderer = self.SystemUrl._get_url_renderer(self.system.id, "store", "res.partner")
+        self.assertIsNone(renderer.pieces)
+        self.assertEqual(renderer.render({"base": "b", "id": "1"}), "b/1/{literal}")
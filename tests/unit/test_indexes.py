@@ -0,0 +1,99 @@
+from odoo.tools import SQL
+
+from ..common_imports import tagged, UNIT_TAGS
+from ..fixtures.base import UnitTestCase
+from ..fixtures.factories import ExternalSystemFactory
+
+
+class ExternalIdIndexChecks:
+    # Shared by the unit checks and the 1M-row benchmark. On the small unit table sequential
+    # scans are disabled, so the checks show which index the planner would pick at scale.
+    ROW_COUNT = 2_000
+    SYSTEM_COUNT = 4
+    FORCE_INDEX_SCAN = True
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.systems = [
+            ExternalSystemFactory.create(cls.env, name=f"Index System {index}", code=f"index_{index}", id_format=False)
+            for index in range(cls.SYSTEM_COUNT)
+        ]
+        # Same external_id values in every system and every tenth row archived, so only the
+        # composite indexes are selective for the real lookups.
+        cls.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO external_id (res_model, res_id, system_id, resource, external_id, active)
+                SELECT 'res.partner', g / %(systems)s + 1, (%(system_ids)s::int[])[g %% %(systems)s + 1],
+                       'default', (g / %(systems)s)::text, g %% 10 <> 0
+                  FROM generate_series(0, %(rows)s - 1) AS g
+                """,
+                systems=cls.SYSTEM_COUNT,
+                system_ids=[system.id for system in cls.systems],
+                rows=cls.ROW_COUNT,
+            )
+        )
+        cls.env.cr.execute("ANALYZE external_id")
+
+    def _plan(self, domain: list) -> str:
+        query = self.ExternalId._search(domain, limit=1)
+        if self.FORCE_INDEX_SCAN:
+            self.env.cr.execute("SET enable_seqscan = off")
+        try:
+            self.env.cr.execute(SQL("EXPLAIN %s", query.select()))
+            return "\n".join(row[0] for row in self.env.cr.fetchall())
+        finally:
+            if self.FORCE_INDEX_SCAN:
+                self.env.cr.execute("RESET enable_seqscan")
+
+    def test_indexes_exist(self) -> None:
+        self.env.cr.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = 'external_id' AND indexname LIKE 'external_id_%_idx'"
+        )
+        names = {row[0] for row in self.env.cr.fetchall()}
+        self.assertIn("external_id_system_value_idx", names)
+
+    def test_get_record_by_external_id_uses_index(self) -> None:
+        plan = self._plan(
+            [("system_id", "=", self.systems[1].id), ("external_id", "=", "123456"), ("active", "=", True)]
+        )
+        self.assertIn("external_id_system_value_idx", plan)
+        self.assertNotIn("Seq Scan", plan)
+
+    def test_get_external_system_id_uses_index(self) -> None:
+        plan = self._plan(
+            [
+                ("res_model", "=", "res.partner"),
+                ("res_id", "=", 123456),
+                ("system_id", "=", self.systems[2].id),
+                ("active", "=", True),
+                ("resource", "=", "default"),
+            ]
+        )
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn("external_id_unique_record_per_system_resource", plan)
+
+    def test_search_by_external_id_uses_index(self) -> None:
+        plan = self._plan(
+            [
+                ("res_model", "=", "res.partner"),
+                ("system_id", "=", self.systems[3].id),
+                ("external_id", "=", "123456"),
+                ("resource", "=", "default"),
+                ("active", "=", True),
+            ]
+        )
+        self.assertNotIn("Seq Scan", plan)
+        self.assertIn("external_id_unique_external_id_per_system_resource", plan)
+
+    def test_name_search_uses_trigram_index(self) -> None:
+        if not self.env.registry.has_trigram:
+            self.skipTest("pg_trgm is not installed")
+        plan = self._plan([("system_id", "in", [self.systems[0].id]), ("external_id", "ilike", "23456")])
+        self.assertIn("external_id_external_id_trgm_idx", plan)
+
+
+@tagged(*UNIT_TAGS)
+class TestExternalIdIndexes(ExternalIdIndexChecks, UnitTestCase):
+    pass